@@ -0,0 +1,55 @@
+import time
+
+import torch
+
+from model.components import LSTMDecoder, FusedLSTMDecoder
+from model.inference_engine import inference_mode
+from task_management.task_list import tasks
+
+
+def benchmark(task, batch_sizes=(1, 4096), sequence_length=100, num_calls=3):
+    """
+    Compares the latency of LSTMDecoder and FusedLSTMDecoder sharing the same weights, and the largest difference
+    between their outputs.
+    """
+    decoder = LSTMDecoder(
+        input_size=task.hidden_size,
+        hidden_size=task.hidden_size,
+        output_size=task.input_size,
+        sequence_length=sequence_length,
+        num_layers=1,
+        batch_first=True
+    ).eval()
+    fused_decoder = FusedLSTMDecoder(
+        input_size=task.hidden_size,
+        hidden_size=task.hidden_size,
+        output_size=task.input_size,
+        sequence_length=sequence_length,
+        num_layers=1,
+        batch_first=True
+    ).eval()
+    fused_decoder.load_state_dict(decoder.state_dict(), strict=True)
+
+    for batch_size in batch_sizes:
+        x = torch.randn(batch_size, 1, task.hidden_size)
+        hidden = (torch.randn(1, batch_size, task.hidden_size), torch.randn(1, batch_size, task.hidden_size))
+        latencies = {}
+        outputs = {}
+
+        with inference_mode():
+            for name, module in (('loop', decoder), ('fused', fused_decoder)):
+                outputs[name], _ = module(x, hidden)
+                start_time = time.perf_counter()
+
+                for _ in range(num_calls):
+                    module(x, hidden)
+
+                latencies[name] = (time.perf_counter() - start_time) / num_calls
+
+        print("Batch size %d: loop %.2f ms, fused %.2f ms, speedup %.2fx, max output difference %.2e"
+              % (batch_size, latencies['loop'] * 1e3, latencies['fused'] * 1e3,
+                 latencies['loop'] / latencies['fused'], (outputs['loop'] - outputs['fused']).abs().max().item()))
+
+
+if __name__ == '__main__':
+    benchmark(task=tasks[105])
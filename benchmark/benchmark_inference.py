@@ -0,0 +1,78 @@
+import time
+from multiprocessing import Process, Queue
+
+import numpy as np
+import torch
+
+from model.composite_model import CompositeModel
+from model.inference_engine import InferenceEngine, get_peak_memory, reset_peak_memory
+from task_management.task_list import tasks
+
+
+def build_model(task):
+    return CompositeModel(
+        task=task,
+        input_size=task.input_size,
+        hidden_size=task.hidden_size,
+        input_sequence_length=50,
+        future_sequence_length=100,
+        num_layers=1,
+        batch_first=True
+    )
+
+
+def run_autograd(task, batch_size, num_calls, queue):
+    """
+    Runs the forward pass the way the prediction path did before the inference engine, with autograd enabled.
+    """
+    model = build_model(task)
+    input_data = torch.rand(batch_size, 50, task.input_size)
+    latencies = []
+    peak_memories = []
+
+    for _ in range(num_calls):
+        reset_peak_memory(torch.device('cpu'))
+        start_time = time.perf_counter()
+        _, decoded_output, forward_output = model.forward(input_data)
+        latencies.append(time.perf_counter() - start_time)
+        peak_memories.append(get_peak_memory(torch.device('cpu')))
+
+    queue.put((np.mean(latencies).item(), max(peak_memories)))
+
+
+def run_engine(task, batch_size, num_calls, queue):
+    """
+    Runs the forward pass through the inference engine.
+    """
+    engine = InferenceEngine(build_model(task), max_batch_size=batch_size, profile=True)
+    input_data = torch.rand(batch_size, 50, task.input_size)
+
+    for _ in range(num_calls):
+        engine.run(input_data)
+
+    engine_summary = engine.summary()
+    queue.put((engine_summary['mean_latency'], engine_summary['peak_memory']))
+
+
+def benchmark(task, batch_sizes=(1, 256, 4096), num_calls=5):
+    """
+    Compares the latency and the peak memory of the two prediction paths on CPU. Each run has its own process so the
+    peak resident set sizes do not mix.
+    """
+    for batch_size in batch_sizes:
+        results = {}
+
+        for name, target in (('autograd', run_autograd), ('engine', run_engine)):
+            queue = Queue()
+            process = Process(target=target, args=(task, batch_size, num_calls, queue))
+            process.start()
+            results[name] = queue.get()
+            process.join()
+
+        print("Batch size %d: autograd %.2f ms / %.1f MB, engine %.2f ms / %.1f MB"
+              % (batch_size, results['autograd'][0] * 1e3, results['autograd'][1] / 2 ** 20,
+                 results['engine'][0] * 1e3, results['engine'][1] / 2 ** 20))
+
+
+if __name__ == '__main__':
+    benchmark(task=tasks[105])
@@ -0,0 +1,47 @@
+import random
+import time
+
+import numpy as np
+
+from benchmark.benchmark_replan import triangle_prediction
+from model.lattice_planner import LatticePlanner
+from model.rrg_planner import RRGPlanner
+
+
+def benchmark(num_plans=50, seed=0):
+    """
+    Compares the random route graph, planned from scratch as planner does, with the space-time lattice A* over the
+    same predictions, by the plan time, the rate of reaching the target and the number of the moves of the paths
+    compared with the fewest moves found by the lattice search.
+    """
+    rng = random.Random(seed)
+    predictions = [triangle_prediction(rng.uniform(-10, 10), rng.choice([-1, 1])) for _ in range(num_plans)]
+    engines = (('rrg', RRGPlanner(load_predictor=False)), ('lattice', LatticePlanner(load_predictor=False)))
+    results = {}
+
+    for name, engine in engines:
+        random.seed(seed)
+        results[name] = []
+
+        for prediction in predictions:
+            if name == 'rrg':
+                engine.reset_roadmap()
+
+            start_time = time.perf_counter()
+            result = engine.plan_prediction(prediction)
+            results[name].append((time.perf_counter() - start_time, result))
+
+    for name, _ in engines:
+        latencies = np.array([latency for latency, _ in results[name]])
+        found = [result.found for _, result in results[name]]
+        extra_moves = [len(result.policy) - len(optimal.policy)
+                       for (_, result), (_, optimal) in zip(results[name], results['lattice'])
+                       if result.found and optimal.found]
+
+        print("%s: found %d/%d, median %.2f ms, mean %.2f ms, mean extra moves %.2f over %d plans"
+              % (name, sum(found), num_plans, np.median(latencies) * 1e3, latencies.mean() * 1e3,
+                 np.mean(extra_moves) if extra_moves else float('nan'), len(extra_moves)))
+
+
+if __name__ == '__main__':
+    benchmark()
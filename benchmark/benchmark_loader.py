@@ -0,0 +1,44 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+from torch.utils.data import DataLoader
+
+from data_processor.data_handler import CsvDataset, MmapDataset, BatchLoader
+
+
+def measure(data_loader, num_epochs):
+    num_samples = 0
+    start_time = time.perf_counter()
+
+    for _ in range(num_epochs):
+        for curr_batch in data_loader:
+            num_samples += curr_batch.shape[0]
+
+    return num_samples / (time.perf_counter() - start_time)
+
+
+def benchmark(num_trajectories=40000, batch_size=4096, num_workers=4, num_epochs=2):
+    """
+    Compares the throughput in samples per second of the DataLoader used by train_model before and BatchLoader, over
+    a CSV data set in memory and a memory-mapped .npy data set with the same random content.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        trajectories = np.random.uniform(-10, 10, (num_trajectories, 150)).astype(np.float32)
+        csv_path = os.path.join(temp_dir, 'trajectories.csv')
+        npy_path = os.path.join(temp_dir, 'trajectories.npy')
+        np.savetxt(csv_path, trajectories, delimiter=',')
+        np.save(npy_path, trajectories)
+
+        for data_set in (CsvDataset(data_file=csv_path), MmapDataset(data_file=npy_path)):
+            data_loader = DataLoader(dataset=data_set, batch_size=batch_size, shuffle=True, num_workers=num_workers,
+                                     drop_last=True)
+            batch_loader = BatchLoader(data_set=data_set, batch_size=batch_size, shuffle=True, drop_last=True)
+
+            print("%s: DataLoader %.0f samples/s, BatchLoader %.0f samples/s"
+                  % (type(data_set).__name__, measure(data_loader, num_epochs), measure(batch_loader, num_epochs)))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,46 @@
+import os
+import random
+import time
+
+import numpy as np
+
+from benchmark.benchmark_replan import triangle_prediction
+from model.parallel_planner import ParallelPlanner
+
+
+def benchmark(worker_counts=None, num_plans=20, time_budget=2.0, seed=0):
+    """
+    Measures the time to the first tree reaching the target against the number of the worker processes, with as many
+    trees as workers, over the same predictions and seeds.
+    """
+    if worker_counts is None:
+        worker_counts = [1]
+
+        while worker_counts[-1] * 2 <= os.cpu_count():
+            worker_counts.append(worker_counts[-1] * 2)
+
+    rng = random.Random(seed)
+    predictions = [triangle_prediction(rng.uniform(-10, 10), rng.choice([-1, 1])) for _ in range(num_plans)]
+
+    for num_workers in worker_counts:
+        with ParallelPlanner(num_workers=num_workers, load_predictor=False) as parallel_planner:
+            # The first plan starts the workers.
+            parallel_planner.plan_prediction(predictions[0], max_iterations=1)
+            parallel_planner.wait_idle()
+            latencies = []
+            num_found = 0
+
+            for k, prediction in enumerate(predictions):
+                start_time = time.perf_counter()
+                reply = parallel_planner.plan_prediction(prediction, mode='first', seed=seed + k * num_workers,
+                                                         time_budget=time_budget)
+                latencies.append(time.perf_counter() - start_time)
+                num_found += reply.found
+                parallel_planner.wait_idle()
+
+        print("%d workers: found %d/%d, median time to first solution %.2f ms, mean %.2f ms"
+              % (num_workers, num_found, num_plans, np.median(latencies) * 1e3, np.mean(latencies) * 1e3))
+
+
+if __name__ == '__main__':
+    benchmark()
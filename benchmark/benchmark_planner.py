@@ -0,0 +1,142 @@
+import os
+import random
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmark.benchmark_replan import triangle_prediction
+from model.lattice_planner import LatticePlanner
+from model.planner import planner
+from model.planner_baseline import planner_baseline
+from model.rrg_planner import RRGPlanner
+
+# The start positions x and the speeds of the obstacle, crossing the middle of the maze from both sides.
+START_STATES = ((-8, 1), (-4, -1), (0, 1), (4, -1), (8, 1))
+COLUMNS = ['commit', 'timestamp', 'planner', 'seed', 'x_start', 'speed', 'found', 'plan_time', 'num_nodes',
+           'num_iterations', 'num_relaxations', 'peak_memory']
+CHECKPOINT_PATH = '../data/checkpoints/checkpoint_task_105.pt'
+
+
+def get_commit():
+    """
+    Gets the short hash of the checked out commit, marked as dirty when the tree has uncommitted changes.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+    return commit + '-dirty' if status else commit
+
+
+def make_planners():
+    """
+    Makes the planners to run, each a function of the seed, the observed and the predicted positions of the obstacle
+    returning a PlanResult. The LSTM planner is only run when the checkpoint is there.
+    """
+    rrg_planner = RRGPlanner(load_predictor=False, rng=random.Random())
+    lattice_planner = LatticePlanner(load_predictor=False)
+
+    def plan_rrg(seed, trajectory, prediction):
+        rrg_planner.reset_roadmap()
+        rrg_planner.sampler.rng.seed(seed)
+
+        return rrg_planner.plan_prediction(prediction)
+
+    planners = {
+        'baseline': lambda seed, trajectory, prediction: planner_baseline(rng=random.Random(seed)),
+        'rrg': plan_rrg,
+        'lattice': lambda seed, trajectory, prediction: lattice_planner.plan_prediction(prediction)
+    }
+
+    if os.path.exists(CHECKPOINT_PATH):
+        planners['lstm'] = lambda seed, trajectory, prediction: planner(trajectory, rng=random.Random(seed))
+
+    return planners
+
+
+def benchmark(num_seeds=10, csv_path='../data/benchmark/planner_benchmark.csv'):
+    """
+    Runs every planner over fixed seeds and start states of the obstacle, and appends the plan time, the number of the
+    nodes, the sampling iterations and the depth relaxations, and the peak memory of each plan to a CSV file,
+    keyed by the commit, so that the commits can be compared with compare. The plans only depend on the seeds, so the
+    same rows are planned at every commit, and the memory is traced in a second run to keep it out of the timings.
+    """
+    commit = get_commit()
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+    planners = make_planners()
+    rows = []
+
+    for x_start, speed in START_STATES:
+        trajectory = triangle_prediction(x_start, speed, length=50)
+        prediction = triangle_prediction(trajectory[-1], speed)
+
+        for name, plan in planners.items():
+            for seed in range(num_seeds):
+                start_time = time.perf_counter()
+                result = plan(seed, trajectory, prediction)
+                plan_time = time.perf_counter() - start_time
+
+                tracemalloc.start()
+                plan(seed, trajectory, prediction)
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                rows.append([commit, timestamp, name, seed, x_start, speed, result.found, plan_time, result.num_nodes,
+                             result.num_iterations, result.num_relaxations, peak_memory])
+
+    df = pd.DataFrame(rows, columns=COLUMNS)
+
+    for name, group in df.groupby('planner', sort=False):
+        print("%s: found %d/%d, median %.2f ms, %.0f nodes, %.0f iterations, %.0f relaxations, %.1f KiB peak"
+              % (name, group['found'].sum(), len(group), group['plan_time'].median() * 1e3,
+                 group['num_nodes'].median(), group['num_iterations'].median(), group['num_relaxations'].median(),
+                 group['peak_memory'].median() / 1024))
+
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+
+    if os.path.exists(csv_path):
+        df = pd.concat([pd.read_csv(csv_path, dtype={'commit': str}), df], ignore_index=True)
+
+    df.to_csv(csv_path, index=False)
+
+    return df
+
+
+def compare(base_commit, new_commit, csv_path='../data/benchmark/planner_benchmark.csv'):
+    """
+    Prints the ratios of the medians of the new commit to those of the base commit for each planner, over the runs of
+    both commits in the CSV file of benchmark, and the number of the plans whose graph changed.
+    """
+    df = pd.read_csv(csv_path, dtype={'commit': str})
+    keys = ['planner', 'seed', 'x_start', 'speed']
+    base = df[df['commit'] == base_commit].drop_duplicates(keys, keep='last')
+    new = df[df['commit'] == new_commit].drop_duplicates(keys, keep='last')
+
+    if base.empty or new.empty:
+        raise ValueError("Unknown commit: %s." % (base_commit if base.empty else new_commit))
+
+    merged = base.merge(new, on=keys, suffixes=('_base', '_new'))
+
+    for name, group in merged.groupby('planner', sort=False):
+        ratios = []
+
+        for column in ('plan_time', 'num_nodes', 'num_relaxations', 'peak_memory'):
+            base_median = group[column + '_base'].median()
+            new_median = group[column + '_new'].median()
+            ratios.append("%s x%.2f" % (column, new_median / base_median) if base_median
+                          else "%s %g -> %g" % (column, base_median, new_median))
+
+        changed = np.sum(group['num_nodes_new'] != group['num_nodes_base'])
+
+        print("%s: %s, %d/%d plans changed" % (name, ', '.join(ratios), changed, len(group)))
+
+
+if __name__ == '__main__':
+    benchmark()
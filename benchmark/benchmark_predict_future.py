@@ -0,0 +1,58 @@
+import time
+
+import torch
+
+from model.composite_model import CompositeModel
+from model.inference_engine import InferenceEngine
+from task_management.task_list import tasks
+
+
+def benchmark(task, batch_sizes=(1, 256), num_calls=5):
+    """
+    Compares the latency of the full forward pass and the prediction-only pass of the inference engine, with the
+    looped and the fused decoders, and checks that both passes give the same forward output.
+    """
+    state_dict = None
+
+    for fused_decoder in (False, True):
+        model = CompositeModel(
+            task=task,
+            input_size=task.input_size,
+            hidden_size=task.hidden_size,
+            input_sequence_length=50,
+            future_sequence_length=100,
+            num_layers=1,
+            batch_first=True,
+            fused_decoder=fused_decoder
+        )
+
+        if state_dict is None:
+            state_dict = model.state_dict()
+        else:
+            model.load_state_dict(state_dict, strict=True)
+
+        engine = InferenceEngine(model, max_batch_size=max(batch_sizes))
+
+        for batch_size in batch_sizes:
+            input_data = torch.rand(batch_size, 50, task.input_size)
+            latencies = {}
+            forward_outputs = {}
+
+            runs = (('full', lambda: engine.run(input_data)[1]), ('future', lambda: engine.run_future(input_data)))
+
+            for name, run in runs:
+                forward_outputs[name] = run().clone()
+                start_time = time.perf_counter()
+
+                for _ in range(num_calls):
+                    run()
+
+                latencies[name] = (time.perf_counter() - start_time) / num_calls
+
+            print("Fused decoder %s, batch size %d: full %.2f ms, prediction only %.2f ms, same output: %s"
+                  % (fused_decoder, batch_size, latencies['full'] * 1e3, latencies['future'] * 1e3,
+                     torch.equal(forward_outputs['full'], forward_outputs['future'])))
+
+
+if __name__ == '__main__':
+    benchmark(task=tasks[105])
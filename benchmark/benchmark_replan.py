@@ -0,0 +1,59 @@
+import random
+import time
+
+import numpy as np
+
+from model.rrg_planner import RRGPlanner
+
+
+def triangle_prediction(x_start, speed, length=100, x_limit=10, displacement=0.255):
+    """
+    Predicts the obstacle bouncing between the limits at its steady speed, like the experiment drives it.
+    """
+    prediction = []
+    x = x_start
+
+    for _ in range(length):
+        x += speed * displacement
+        prediction.append(x)
+
+        if x < -x_limit:
+            speed = 1
+
+        if x > x_limit:
+            speed = -1
+
+    return np.array(prediction)
+
+
+def benchmark(num_replans=50, seed=0):
+    """
+    Compares replanning from scratch with replanning on the roadmap kept by RRGPlanner, over the same sequence of
+    predictions. The predictor is not needed, since the predictions are passed to plan_prediction directly.
+    """
+    rng = random.Random(seed)
+    predictions = [triangle_prediction(rng.uniform(-10, 10), rng.choice([-1, 1])) for _ in range(num_replans)]
+    rrg_planner = RRGPlanner(load_predictor=False)
+
+    for name, keep_roadmap in (('scratch', False), ('roadmap', True)):
+        rrg_planner.reset_roadmap()
+        random.seed(seed)
+        latencies = []
+        num_found = 0
+
+        for prediction in predictions:
+            if not keep_roadmap:
+                rrg_planner.reset_roadmap()
+
+            start_time = time.perf_counter()
+            result = rrg_planner.plan_prediction(prediction)
+            latencies.append(time.perf_counter() - start_time)
+            num_found += result.found
+
+        print("%s: found %d/%d, median %.2f ms, mean %.2f ms, roadmap of %d nodes"
+              % (name, num_found, num_replans, np.median(latencies) * 1e3, np.mean(latencies) * 1e3,
+                 rrg_planner.num_nodes))
+
+
+if __name__ == '__main__':
+    benchmark()
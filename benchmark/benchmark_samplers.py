@@ -0,0 +1,33 @@
+import random
+import time
+
+import numpy as np
+
+from model.planner_baseline import planner_baseline
+
+SAMPLERS = ('uniform', 'goal', 'frontier', 'lattice', 'random_lattice')
+
+
+def benchmark(num_seeds=30):
+    """
+    Compares the samplers on the baseline planner, which needs no checkpoint, by the iterations needed to reach the
+    target and the rate of the samples adding a node.
+    """
+    for sampler in SAMPLERS:
+        iterations = []
+        acceptance_rates = []
+        start_time = time.perf_counter()
+
+        for seed in range(num_seeds):
+            random.seed(seed)
+            result = planner_baseline(sampler=sampler)
+            iterations.append(result.num_iterations)
+            acceptance_rates.append(result.sample_counts['acceptance_rate'])
+
+        print("%s: median %.1f iterations, acceptance rate %.3f, %.2f ms per plan"
+              % (sampler, np.median(iterations), np.mean(acceptance_rates),
+                 (time.perf_counter() - start_time) / num_seeds * 1e3))
+
+
+if __name__ == '__main__':
+    benchmark()
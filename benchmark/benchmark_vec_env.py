@@ -0,0 +1,44 @@
+import time
+
+import numpy as np
+
+from sim_env.kinematic_env import KinematicSimEnv
+from sim_env.vec_env import VecSimEnv
+
+
+def benchmark(num_envs=(1, 100, 1000, 10000), num_steps=100, seed=0):
+    """
+    Compares the episode steps per second of KinematicSimEnv stepping the episodes one by one and VecSimEnv stepping
+    them together, with random speeds.
+    """
+    rng = np.random.default_rng(seed)
+
+    for n in num_envs:
+        speeds = rng.choice([-1.0, 0.0, 1.0], size=(num_steps, n, 3))
+
+        env = KinematicSimEnv(xml_name="maze.xml")
+        num_single = min(n, 100)
+        start_time = time.perf_counter()
+
+        for i in range(num_single):
+            env.reset()
+
+            for step in range(num_steps):
+                env.step(speeds[step, i])
+
+        single_rate = num_single * num_steps / (time.perf_counter() - start_time)
+
+        vec_env = VecSimEnv(xml_name="maze.xml", num_envs=n)
+        start_time = time.perf_counter()
+
+        for step in range(num_steps):
+            vec_env.step(speeds[step])
+
+        vec_rate = n * num_steps / (time.perf_counter() - start_time)
+
+        print("%d episodes: single %.3g steps/s, vectorized %.3g steps/s, %.1f%% done"
+              % (n, single_rate, vec_rate, vec_env.done.mean() * 100))
+
+
+if __name__ == '__main__':
+    benchmark()
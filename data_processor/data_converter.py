@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+
+def convert_csv_to_npy(csv_path, npy_path, chunk_size=10000):
+    """
+    Converts a headerless CSV data set into a float32 .npy file without loading the whole CSV into memory.
+    :param csv_path: the path of the CSV file
+    :param npy_path: the path of the output .npy file
+    :param chunk_size: the number of the rows parsed at once
+    :return: the shape of the converted data
+    """
+
+    print("Converting %s..." % csv_path)
+
+    with open(csv_path, 'r') as f:
+        num_columns = len(f.readline().split(','))
+        num_rows = 1 + sum(1 for line in f if line.strip())
+
+    data = np.lib.format.open_memmap(npy_path, mode='w+', dtype=np.float32, shape=(num_rows, num_columns))
+    row = 0
+
+    for chunk in pd.read_csv(csv_path, header=None, chunksize=chunk_size, dtype=np.float32):
+        data[row: row + chunk.shape[0]] = chunk.values
+        row += chunk.shape[0]
+
+    data.flush()
+    del data
+
+    print("The shape of the converted data:", (num_rows, num_columns))
+
+    return num_rows, num_columns
+
+
+if __name__ == '__main__':
+    raw_data_name = 'raw_data_102'
+
+    for split in ['train', 'valid', 'test']:
+        convert_csv_to_npy(
+            csv_path='../data/data_set/' + raw_data_name + '_' + split + '.csv',
+            npy_path='../data/data_set/' + raw_data_name + '_' + split + '.npy'
+        )
@@ -1,34 +1,53 @@
-from multiprocessing import Process
-import random
 import numpy as np
 
 
-def data_generator(task_id):
-    data = []
-    limit = 10
+def generate_trajectories(num_trajectories, length=150, limit=10, seed=None, chunk_size=100000):
+    """
+    Generates the trajectories of an obstacle bouncing between -1 and 1 with a step of 0.25 / limit.
+
+    Every trajectory starts at a uniformly random position in a random direction, walks on the lattice of its start
+    position, and turns back at the last lattice point before each bound, so it is a triangle wave over the lattice
+    index that can be computed for all trajectories at once.
+    :param num_trajectories: the number of the trajectories
+    :param length: the number of the positions of each trajectory
+    :param limit: the scale of the obstacle positions
+    :param seed: the seed of the random starts and directions
+    :param chunk_size: the number of the trajectories computed at once to bound the memory of the intermediates
+    :return: a (num_trajectories, length) float32 array
+    """
+    rng = np.random.default_rng(seed)
     step = 0.25 / limit
+    x_start = rng.uniform(-1, 1, num_trajectories)
+    direction = rng.choice([-1, 1], num_trajectories)
+    data = np.empty((num_trajectories, length), dtype=np.float32)
+    time_steps = np.arange(length, dtype=np.int32)
 
-    for j in range(11000):
-        x_start = random.uniform(-1, 1)
-        direction = random.choice([-1, 1])
-        x_1 = np.arange(x_start, direction, direction * step)
-        x_2 = np.arange(x_1[-1] - direction * step, -direction, -direction * step)
-        x_3 = np.arange(x_2[-1] + direction * step, direction, direction * step)
-        x = np.concatenate((x_1, x_2, x_3))[:150]
-        data.append(x)
+    for start in range(0, num_trajectories, chunk_size):
+        end = min(start + chunk_size, num_trajectories)
+        x_0 = x_start[start:end, None]
+        d = direction[start:end, None]
 
-    np.savetxt('../data/raw/raw_data_101_%s.csv' % task_id, data, delimiter=',')
+        # Positions along the direction of motion are x_0 * d + j * step for the lattice index j.
+        pos_0 = x_0 * d
+        j_max = np.ceil((1 - pos_0) / step).astype(np.int32) - 1
+        j_min = np.floor((-1 - pos_0) / step).astype(np.int32) + 1
+        half_period = j_max - j_min
+        phase = (time_steps - j_min) % (2 * half_period)
+        j = j_max - np.abs(phase - half_period)
 
+        data[start:end] = x_0 + (d * step) * j
 
-if __name__ == '__main__':
-    process_list = []
-    num_process = 10
+    return data
+
+
+def data_generator(task_id, num_trajectories=11000):
+    data = generate_trajectories(num_trajectories=num_trajectories, seed=task_id)
 
-    for i in range(num_process):
-        process_list.append(Process(target=data_generator, args=(i,)))
+    np.save('../data/raw/raw_data_101_%s.npy' % task_id, data)
 
-    for i in range(num_process):
-        process_list[i].start()
 
-    for i in range(num_process):
-        process_list[i].join()
+if __name__ == '__main__':
+    num_shards = 10
+
+    for i in range(num_shards):
+        data_generator(i)
@@ -1,3 +1,6 @@
+import os
+
+import numpy as np
 import torch
 from torch.utils.data import Dataset
 import pandas as pd
@@ -20,3 +23,89 @@ class CsvDataset(Dataset):
 
     def __getitem__(self, idx):
         return self.data[idx]
+
+
+class MmapDataset(Dataset):
+    """
+    A data set backed by a memory-mapped float32 .npy file, so opening it takes constant time and the pages are
+    shared by all processes reading the same file.
+    """
+
+    def __init__(self, data_file):
+        super(MmapDataset, self).__init__()
+
+        self.data_file = data_file
+        self.data = np.load(data_file, mmap_mode='r')
+
+        print("Data set dimension:", self.data.shape + (1,))
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, idx):
+        return torch.from_numpy(np.array(self.data[:, :, None][idx], dtype=np.float32))
+
+    def __getstate__(self):
+        # The workers reopen the file instead of receiving a pickled copy of the data.
+        state = self.__dict__.copy()
+        state['data'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.data = np.load(self.data_file, mmap_mode='r')
+
+
+class BatchLoader:
+    """
+    Yields whole batches of a data set by indexing it with an array of indices, without worker processes and without
+    collating single items.
+    """
+
+    def __init__(self, data_set, batch_size, shuffle=False, drop_last=False, generator=None):
+        """
+        The initialization of the class.
+        :param data_set: a data set that accepts an array of indices, such as CsvDataset or MmapDataset
+        :param batch_size: the number of the samples in a batch
+        :param shuffle: True to reshuffle the samples at every epoch
+        :param drop_last: True to drop the last incomplete batch
+        :param generator: the torch.Generator used to shuffle
+        """
+        self.data_set = data_set
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.generator = generator
+
+    def __len__(self):
+        if self.drop_last:
+            return len(self.data_set) // self.batch_size
+        else:
+            return (len(self.data_set) + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        num_samples = len(self.data_set)
+
+        if self.shuffle:
+            indices = torch.randperm(num_samples, generator=self.generator).numpy()
+        else:
+            indices = np.arange(num_samples)
+
+        for i_batch in range(len(self)):
+            batch_indices = indices[i_batch * self.batch_size: (i_batch + 1) * self.batch_size]
+
+            # The order inside a batch does not matter, and sorted indices read a memory-mapped file sequentially.
+            yield self.data_set[np.sort(batch_indices)]
+
+
+def load_data_set(data_file_prefix):
+    """
+    Loads a data set from the .npy file with the given prefix if it exists, or from the .csv file otherwise.
+    :param data_file_prefix: the path of the data file without the extension
+    :return: the data set
+    """
+    if os.path.exists(data_file_prefix + '.npy'):
+        return MmapDataset(data_file=data_file_prefix + '.npy')
+    else:
+        return CsvDataset(data_file=data_file_prefix + '.csv')
@@ -0,0 +1,158 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+def read_shard(shard_path, chunk_rows):
+    """
+    Reads a .npy or headerless .csv shard in chunks.
+    :param shard_path: the path of the shard
+    :param chunk_rows: the number of the rows of each chunk
+    :return: a generator of float32 arrays
+    """
+    if shard_path.endswith('.npy'):
+        shard = np.load(shard_path, mmap_mode='r')
+
+        for start in range(0, shard.shape[0], chunk_rows):
+            yield np.asarray(shard[start: start + chunk_rows], dtype=np.float32)
+    else:
+        for chunk in pd.read_csv(shard_path, header=None, chunksize=chunk_rows, dtype=np.float32):
+            yield chunk.values
+
+
+class SplitWriter:
+    """
+    Writes the rows of a stream into consecutive data set splits of the given sizes.
+    """
+
+    def __init__(self, output_prefix, split_sizes, num_columns, output_format):
+        """
+        The initialization of the class.
+        :param output_prefix: the path prefix of the split files, which get the suffix _<split name>
+        :param split_sizes: the list of (split name, number of rows)
+        :param num_columns: the number of the columns of each row
+        :param output_format: 'npy' or 'csv'
+        """
+        self.outputs = []
+
+        for split_name, split_size in split_sizes:
+            output_path = output_prefix + '_' + split_name + '.' + output_format
+
+            if output_format == 'npy':
+                output = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.float32,
+                                                   shape=(split_size, num_columns))
+            else:
+                output = open(output_path, 'w')
+
+            self.outputs.append([output, split_size, 0])
+
+        self.split_index = 0
+
+    def write(self, rows):
+        while rows.shape[0] > 0 and self.split_index < len(self.outputs):
+            output, split_size, written = self.outputs[self.split_index]
+            num_rows = min(rows.shape[0], split_size - written)
+
+            if isinstance(output, np.memmap):
+                output[written: written + num_rows] = rows[:num_rows]
+            else:
+                np.savetxt(output, rows[:num_rows], delimiter=',', fmt='%.9g')
+
+            self.outputs[self.split_index][2] += num_rows
+            rows = rows[num_rows:]
+
+            if self.outputs[self.split_index][2] == split_size:
+                self.split_index += 1
+
+    def close(self):
+        for output, _, _ in self.outputs:
+            if isinstance(output, np.memmap):
+                output.flush()
+            else:
+                output.close()
+
+        self.outputs = []
+
+
+def shuffle_split(shard_paths, output_prefix, split_sizes, seed=None, chunk_rows=100000, num_buckets=64,
+                  output_format='npy', temp_dir=None):
+    """
+    Combines the shards, shuffles all rows and writes the data set splits with bounded memory.
+
+    The first pass scatters the rows of every chunk into randomly chosen bucket files, and the second pass shuffles
+    each bucket in memory and streams it into the splits, which is a uniform random permutation of all rows. The memory
+    is bounded by one chunk in the first pass and one bucket, about 1 / num_buckets of the data, in the second pass.
+    :param shard_paths: the list of the paths of the .npy or .csv shards
+    :param output_prefix: the path prefix of the split files, which get the suffix _<split name>
+    :param split_sizes: the list of (split name, number of rows), where the last number may be None for all the rest
+    :param seed: the seed of the shuffle
+    :param chunk_rows: the number of the rows read at once
+    :param num_buckets: the number of the bucket files
+    :param output_format: 'npy' or 'csv'
+    :param temp_dir: the directory of the bucket files, or None for the directory of the outputs
+    :return: the list of (split name, number of rows) written
+    """
+    rng = np.random.default_rng(seed)
+    bucket_dir = tempfile.mkdtemp(dir=temp_dir if temp_dir is not None else os.path.dirname(output_prefix) or '.')
+    bucket_paths = [os.path.join(bucket_dir, 'bucket_%d.bin' % i) for i in range(num_buckets)]
+    num_rows = 0
+    num_columns = None
+
+    try:
+        print("Scattering the rows into the buckets...")
+
+        bucket_files = [open(path, 'wb') for path in bucket_paths]
+
+        for shard_path in shard_paths:
+            for chunk in read_shard(shard_path, chunk_rows):
+                num_columns = chunk.shape[1]
+                num_rows += chunk.shape[0]
+                buckets = rng.integers(num_buckets, size=chunk.shape[0])
+                order = np.argsort(buckets, kind='stable')
+                bounds = np.cumsum(np.bincount(buckets, minlength=num_buckets))
+
+                for i_bucket, rows in enumerate(np.split(chunk[order], bounds[:-1])):
+                    rows.tofile(bucket_files[i_bucket])
+
+        for f in bucket_files:
+            f.close()
+
+        split_sizes = list(split_sizes)
+        assigned = sum(size for _, size in split_sizes if size is not None)
+
+        if assigned > num_rows:
+            raise ValueError("The splits need %d rows but the shards only have %d." % (assigned, num_rows))
+
+        split_sizes = [(name, num_rows - assigned if size is None else size) for name, size in split_sizes]
+
+        print("Writing the splits...")
+
+        writer = SplitWriter(output_prefix, split_sizes, num_columns, output_format)
+
+        for path in bucket_paths:
+            rows = np.fromfile(path, dtype=np.float32).reshape(-1, num_columns)
+            rng.shuffle(rows)
+            writer.write(rows)
+
+        writer.close()
+    finally:
+        shutil.rmtree(bucket_dir)
+
+    print("The sizes of the generated data sets:", split_sizes)
+    print("Task Done.")
+
+    return split_sizes
+
+
+if __name__ == '__main__':
+    raw_data_name = 'raw_data_101'
+
+    shuffle_split(
+        shard_paths=['../data/raw/' + raw_data_name + '_%d.npy' % i for i in range(10)],
+        output_prefix='../data/data_set/' + raw_data_name,
+        split_sizes=[('train', 100000), ('valid', 10000), ('test', None)],
+        seed=0
+    )
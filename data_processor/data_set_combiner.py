@@ -1,9 +1,10 @@
+import numpy as np
 import pandas as pd
 
 frames = []
 
 for i in range(10):
-    df = pd.read_csv('../data/raw/raw_data_101_%s.csv' % i, header=None)
+    df = pd.DataFrame(np.load('../data/raw/raw_data_101_%s.npy' % i))
     frames.append(df)
 
 df = pd.concat(frames).sample(frac=1)
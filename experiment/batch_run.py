@@ -0,0 +1,213 @@
+import math
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from data_processor.data_recorder import DataRecorder
+from model.lattice_planner import LatticePlanner
+from model.maze import get_predictor, reached_goal
+from model.planner import planner
+from model.planner_baseline import planner_baseline
+from sim_env.vec_env import VecSimEnv
+
+PLANNERS = ('lstm', 'baseline', 'lattice')
+EPISODE_COLUMNS = ['planner', 'seed', 'success', 'failure', 'found', 'plan_attempts', 'plan_time', 'path_steps',
+                   'path_length', 'episode_steps', 'wall_time', 'prediction_time', 'search_time']
+SUMMARY_COLUMNS = ['planner', 'episodes', 'success_rate', 'found_rate', 'no_plan_rate', 'collision_rate',
+                   'mean_plan_time', 'median_plan_time', 'max_plan_time', 'median_prediction_time',
+                   'median_search_time', 'mean_path_length', 'wall_time', 'episodes_per_second']
+
+# The predictor and the lattice planner of the process, loaded once by _init_worker and shared by its episodes.
+_worker_predictor = None
+_worker_lattice_planner = None
+
+
+def _init_worker():
+    global _worker_predictor, _worker_lattice_planner
+
+    _worker_predictor = get_predictor()
+    _worker_lattice_planner = LatticePlanner(predictor=_worker_predictor)
+
+
+def plan(planner_name, obs, time_budget=None, rng=None):
+    """
+    Calls the given planner once with the predictor of the process.
+
+    :param planner_name: 'lstm', 'baseline' or 'lattice'
+    :param obs: the observed positions x of the obstacle
+    :param time_budget: the time budget of the planner, or None
+    :param rng: the random.Random of the samples of the planner, which the lattice planner does not need
+    :return: a PlanResult
+    """
+    if planner_name == 'lstm':
+        return planner(obs, time_budget=time_budget, rng=rng, predictor=_worker_predictor)
+
+    if planner_name == 'lattice':
+        return _worker_lattice_planner.plan(obs, time_budget=time_budget)
+
+    return planner_baseline(time_budget=time_budget, rng=rng)
+
+
+def run_episode(planner_name, seed, time_budget=None, x_limit=10, num_observations=50, max_plan_attempts=20):
+    """
+    Runs one headless episode like experiment_run.py and experiment_run_baseline.py: the obstacle is observed for a
+    while, the planner plans, and the agent follows the policy until it reaches the goal, collides or runs out of the
+    policy. The goal is checked with reached_goal at the end of every move as in the experiments, and a collision at
+    every step, since the headless environment does not stop the agent at the walls. The start of the obstacle and the
+    random samples of the planner only depend on the seed, so all the planners face the same obstacles.
+
+    The predictor is loaded once per process, outside of the plan time, which only covers the planner calls.
+
+    :param planner_name: 'lstm', 'baseline' or 'lattice'
+    :param seed: the seed of the episode
+    :param time_budget: the time budget of the anytime planner, which is called only once, or None to call the
+        planner until it returns a policy
+    :param x_limit: the limit of the obstacle position x
+    :param num_observations: the number of the steps the obstacle is observed before planning
+    :param max_plan_attempts: the number of the times the planner is called until it returns a policy
+    :return: a list in the order of EPISODE_COLUMNS
+    """
+    if planner_name != 'baseline' and _worker_predictor is None:
+        _init_worker()
+
+    start_time = time.perf_counter()
+    rng = random.Random(seed)
+    env = VecSimEnv(xml_name="maze.xml", num_envs=1)
+    x_start = rng.uniform(-x_limit, x_limit)
+    obstacle_speed = rng.choice([-1, 1])
+    env.reset(obstacle_pos=(x_start, 0), agent_pos=(2, -11.0))
+    obs = []
+
+    for i in range(num_observations):
+        obstacle_x = env.get_xpos(env.obstacle_body_index)[0].tolist()
+        obs.append(obstacle_x[0])
+
+        env.step([obstacle_speed, 0, 0])
+
+        if obstacle_x[0] < -x_limit:
+            obstacle_speed = 1
+
+        if obstacle_x[0] > x_limit:
+            obstacle_speed = -1
+
+    policy = None
+    found = False
+    plan_attempts = 0
+    prediction_time = 0.0
+    search_time = 0.0
+    plan_start_time = time.perf_counter()
+
+    while policy is None and plan_attempts < (1 if time_budget is not None else max_plan_attempts):
+        plan_attempts += 1
+        result = plan(planner_name, obs, time_budget=time_budget, rng=rng)
+        policy, found = result.policy, result.found
+        prediction_time += result.timings['prediction']
+        search_time += result.timings['search']
+
+    plan_time = time.perf_counter() - plan_start_time
+
+    if policy is None:
+        return [planner_name, seed, False, 'no_plan', found, plan_attempts, plan_time, 0, 0.0, 0,
+                time.perf_counter() - start_time, prediction_time, search_time]
+
+    path_length = sum(2.5 * math.hypot(dx, dy) for dx, dy in policy)
+    failure = 'policy_exhausted'
+    idx = 0
+
+    # Each move of the policy lasts 10 steps.
+    while idx < 10 * len(policy):
+        obstacle_x = env.get_xpos(env.obstacle_body_index)[0].tolist()
+        agent_x = env.get_xpos(env.agent_body_index)[0].tolist()
+        move = policy[idx // 10]
+        env.step([obstacle_speed, move[0], move[1]])
+
+        if obstacle_x[0] < -x_limit:
+            obstacle_speed = 1
+
+        if obstacle_x[0] > x_limit:
+            obstacle_speed = -1
+
+        idx += 1
+
+        if env.collided[0]:
+            failure = 'collision'
+            break
+
+        if idx % 10 == 0 and reached_goal(agent_x[0], agent_x[1]):
+            failure = ''
+            break
+
+    return [planner_name, seed, failure == '', failure, found, plan_attempts, plan_time, len(policy), path_length, idx,
+            time.perf_counter() - start_time, prediction_time, search_time]
+
+
+def _run_episode(args):
+    return run_episode(*args)
+
+
+def batch_run(num_episodes=100, first_seed=0, time_budget=None, processes=None, output_dir='../data/experiment/'):
+    """
+    Runs the same seeded episodes for every planner across a process pool, and writes the results of every episode and
+    a summary per planner into CSV files.
+
+    :param num_episodes: the number of the episodes of each planner
+    :param first_seed: the seed of the first episode, incremented for each of the others
+    :param time_budget: the time budget of the anytime planners, or None
+    :param processes: the number of the worker processes, or None for the number of the CPUs
+    :param output_dir: the directory of the CSV files
+    :return: the summary as a DataFrame
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    episode_recorder = DataRecorder(column=EPISODE_COLUMNS)
+    summary_recorder = DataRecorder(column=SUMMARY_COLUMNS)
+    seeds = range(first_seed, first_seed + num_episodes)
+
+    with Pool(processes=processes, initializer=_init_worker) as pool:
+        for planner_name in PLANNERS:
+            start_time = time.perf_counter()
+            results = []
+
+            for result in pool.imap_unordered(_run_episode, [(planner_name, seed, time_budget) for seed in seeds]):
+                results.append(result)
+                episode_recorder.append(result)
+                print("Planner %s, seed %d: %s" % (planner_name, result[1], 'success' if result[2] else result[3]))
+
+            wall_time = time.perf_counter() - start_time
+            success = np.array([result[2] for result in results])
+            failures = np.array([result[3] for result in results])
+            found = np.array([result[4] for result in results])
+            plan_times = np.array([result[6] for result in results])
+            prediction_times = np.array([result[11] for result in results])
+            search_times = np.array([result[12] for result in results])
+            path_lengths = np.array([result[8] for result in results])
+
+            summary_recorder.append([
+                planner_name,
+                len(results),
+                success.mean(),
+                found.mean(),
+                np.mean(failures == 'no_plan'),
+                np.mean(failures == 'collision'),
+                plan_times.mean(),
+                np.median(plan_times),
+                plan_times.max(),
+                np.median(prediction_times),
+                np.median(search_times),
+                path_lengths[success].mean() if success.any() else float('nan'),
+                wall_time,
+                len(results) / wall_time
+            ])
+
+    episode_recorder.df.sort_values(['planner', 'seed'], inplace=True)
+    episode_recorder.save_to_csv(os.path.join(output_dir, 'batch_run_episodes.csv'))
+    summary_recorder.save_to_csv(os.path.join(output_dir, 'batch_run_summary.csv'))
+    print(summary_recorder.df.to_string(index=False))
+
+    return summary_recorder.df
+
+
+if __name__ == '__main__':
+    batch_run(num_episodes=100)
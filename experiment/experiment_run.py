@@ -1,15 +1,24 @@
 import random
+import sys
 import time
-from multiprocessing import Process, Manager
 
-from model.planner import planner
+from model.maze import reached_goal
+from model.planning_service import PlanningService
 from sim_env.env import SimEnv
 
+# The workers start, and load the predictor, while the obstacle is observed.
+service = PlanningService(planner_name='lstm')
 env = SimEnv(xml_name="maze.xml", recompile_cpp=True, rendering=True)
 x_limit = 10
-x_start = random.uniform(-x_limit, x_limit)
-obstacle_speed = random.choice([-1, 1])
+
+# The seed of the run, from the command line or drawn and printed, decides the obstacle and the plan.
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else random.randrange(2 ** 32)
+print("Seed:", seed)
+rng = random.Random(seed)
+x_start = rng.uniform(-x_limit, x_limit)
+obstacle_speed = rng.choice([-1, 1])
 env.reset(obstacle_pos=(x_start, 0), agent_pos=(2, -11.0))
+env.get_state()
 done = False
 idx = 0
 step = 0
@@ -18,10 +27,10 @@ obs = []
 
 for i in range(50):
     env.render()
-    obstacle_x = env.get_xpos(env.obstacle_body_index)
+    obstacle_x = env.state_xpos[env.obstacle_body_index].tolist()
     obs.append(obstacle_x[0])
 
-    env.step([obstacle_speed, 0, 0])
+    env.step_and_observe([obstacle_speed, 0, 0])
 
     if obstacle_x[0] < -10:
         obstacle_speed = 1
@@ -29,37 +38,27 @@ for i in range(50):
     if obstacle_x[0] > 10:
         obstacle_speed = -1
 
+future = service.submit(obs, max_attempts=None, seed=seed)
 
-def task(trajectory, policy_shared):
-    temp_p = None
-
-    while temp_p is None:
-        temp_p = planner(trajectory)
-
-    policy_shared += temp_p
-    switch.value = 0
-
-
-switch = Manager().Value('i', 1)
-policy = Manager().list()
-cal = Process(target=task, args=(obs, policy))
-cal.start()
-
-while switch.value == 1:
+# The plan is made in a worker, which calls the planner until it returns a policy, while the window is kept alive.
+while PlanningService.poll(future) is None:
     env.render()
 
+reply = future.result()
+service.close()
+policy = reply.policy.tolist()
 print(policy)
 
 while not done:
     env.render()
-    obstacle_x = env.get_xpos(env.obstacle_body_index)
-    agent_x = env.get_xpos(env.agent_body_index)
+    obstacle_x = env.state_xpos[env.obstacle_body_index].tolist()
+    agent_x = env.state_xpos[env.agent_body_index].tolist()
 
     if step >= len(policy):
         print("Failed.")
         break
 
-    env.step([obstacle_speed, policy[step][0], policy[step][1]])
+    env.step_and_observe([obstacle_speed, policy[step][0], policy[step][1]])
 
     if obstacle_x[0] < -10:
         obstacle_speed = 1
@@ -72,7 +71,7 @@ while not done:
     if idx % 10 == 0:
         step += 1
 
-        if agent_x[0] < -4 and agent_x[1] > 10:
+        if reached_goal(agent_x[0], agent_x[1]):
             done = True
 
     time.sleep(0.1)
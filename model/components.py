@@ -57,3 +57,74 @@ class LSTMDecoder(nn.Module):
         decoded_output = torch.stack(decoded_output, 1).squeeze(2)
 
         return decoded_output, hidden
+
+    def propagate(self, x, hidden):
+        output = x
+
+        for idx in range(self.sequence_length_):
+            output, hidden = self.decoder_(output, hidden)
+
+        return hidden
+
+
+class FusedLSTMDecoder(LSTMDecoder):
+    """
+    An LSTMDecoder that steps the LSTM cells directly and applies the fully connected layer once to all steps.
+
+    It has the same parameters as LSTMDecoder, so the checkpoints of either one can be loaded into the other.
+    """
+
+    def __init__(self, input_size, hidden_size, output_size, sequence_length, num_layers, batch_first=True):
+        if not batch_first:
+            raise ValueError("FusedLSTMDecoder only supports batch_first=True.")
+
+        super(FusedLSTMDecoder, self).__init__(
+            input_size=input_size,
+            hidden_size=hidden_size,
+            output_size=output_size,
+            sequence_length=sequence_length,
+            num_layers=num_layers,
+            batch_first=batch_first
+        )
+
+    def forward(self, x, hidden):
+        lstm_output = x.new_empty(x.shape[0], self.sequence_length_, self.hidden_size_)
+        hidden = self._unroll(x, hidden, lstm_output)
+        decoded_output = self.fc_layer_(lstm_output)
+
+        return decoded_output, hidden
+
+    def propagate(self, x, hidden):
+        return self._unroll(x, hidden)
+
+    def _unroll(self, x, hidden, lstm_output=None):
+        hidden_states = list(hidden[0].unbind(0))
+        cell_states = list(hidden[1].unbind(0))
+        layer_weights = [self.decoder_.all_weights[layer] for layer in range(self.num_layers_)]
+        output = x[:, 0, :]
+
+        if self.num_layers_ == 1:
+            # From the second step on, the input of a single layer is its own hidden state, so the input and the
+            # hidden matrix products collapse into one.
+            weight_ih, weight_hh, bias_ih, bias_hh = layer_weights[0]
+            merged_weight = (weight_ih + weight_hh).t()
+            merged_bias = bias_ih + bias_hh
+
+        for idx in range(self.sequence_length_):
+            if idx > 0 and self.num_layers_ == 1:
+                gates = torch.addmm(merged_bias, output, merged_weight)
+                input_gate, forget_gate, cell_gate, output_gate = gates.chunk(4, 1)
+                cell_states[0] = torch.sigmoid(forget_gate) * cell_states[0] \
+                    + torch.sigmoid(input_gate) * torch.tanh(cell_gate)
+                hidden_states[0] = torch.sigmoid(output_gate) * torch.tanh(cell_states[0])
+                output = hidden_states[0]
+            else:
+                for layer in range(self.num_layers_):
+                    hidden_states[layer], cell_states[layer] = torch.lstm_cell(
+                        output, (hidden_states[layer], cell_states[layer]), *layer_weights[layer])
+                    output = hidden_states[layer]
+
+            if lstm_output is not None:
+                lstm_output[:, idx, :] = output
+
+        return torch.stack(hidden_states), torch.stack(cell_states)
@@ -2,12 +2,13 @@ from torch import nn
 
 from model.components import LSTMEncoder
 from model.components import LSTMDecoder
+from model.components import FusedLSTMDecoder
 
 
 class CompositeModel(nn.Module):
 
     def __init__(self, task, input_size, hidden_size, input_sequence_length, future_sequence_length,
-                 num_layers, batch_first=True):
+                 num_layers, batch_first=True, fused_decoder=False):
         super(CompositeModel, self).__init__()
 
         self.task = task
@@ -17,6 +18,8 @@ class CompositeModel(nn.Module):
         self.future_sequence_length = future_sequence_length
         self.num_layers = num_layers
         self.batch_firs = batch_first
+        self.fused_decoder = fused_decoder
+        decoder_class = FusedLSTMDecoder if fused_decoder else LSTMDecoder
 
         self.encoder_ = LSTMEncoder(
             input_size=input_size,
@@ -25,7 +28,7 @@ class CompositeModel(nn.Module):
             batch_first=batch_first
         )
 
-        self.decoder_ = LSTMDecoder(
+        self.decoder_ = decoder_class(
             input_size=hidden_size,
             hidden_size=hidden_size,
             output_size=input_size,
@@ -34,7 +37,7 @@ class CompositeModel(nn.Module):
             sequence_length=input_sequence_length
         )
 
-        self.future_predictor_ = LSTMDecoder(
+        self.future_predictor_ = decoder_class(
             input_size=hidden_size,
             hidden_size=hidden_size,
             output_size=input_size,
@@ -49,3 +52,28 @@ class CompositeModel(nn.Module):
         forward_output, hidden = self.future_predictor_(encoded_output, hidden)
 
         return encoded_output, decoded_output, forward_output
+
+    def predict_future(self, x):
+        """
+        Computes only the forward output. The reconstruction decoder still has to be unrolled because its final state
+        is the initial state of the future predictor, but its outputs are neither projected nor kept.
+
+        :param x: the input sequences
+        :return: the forward output, which is the same as the one of forward
+        """
+        encoded_output, hidden = self.encoder_(x)
+
+        return self.predict_future_from_state(encoded_output, hidden)
+
+    def predict_future_from_state(self, encoded_output, hidden):
+        """
+        Computes the forward output from the final state of the encoder.
+
+        :param encoded_output: the last output of the encoder
+        :param hidden: the final hidden and cell states of the encoder
+        :return: the forward output
+        """
+        hidden = self.decoder_.propagate(encoded_output, hidden)
+        forward_output, hidden = self.future_predictor_(encoded_output, hidden)
+
+        return forward_output
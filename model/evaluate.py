@@ -3,7 +3,8 @@ from torch import nn
 import numpy as np
 
 from model.composite_model import CompositeModel
-from data_processor.data_handler import CsvDataset
+from model.inference_engine import InferenceEngine
+from data_processor.data_handler import load_data_set
 from task_management.task_list import tasks
 
 
@@ -22,8 +23,7 @@ def evaluate_model(task, checkpoint_path):
     )
     model.load_state_dict(torch.load(checkpoint_path), strict=True)
 
-    data_file = '../data/data_set/' + task.data_set_csv + '_test.csv'
-    data_set = CsvDataset(data_file=data_file)
+    data_set = load_data_set(data_file_prefix='../data/data_set/' + task.data_set_csv + '_test')
 
     normalized_trajectories = data_set[:, :, :] / x_limit
 
@@ -31,7 +31,8 @@ def evaluate_model(task, checkpoint_path):
     future_data = normalized_trajectories[:, input_sequence_length:, :]
     input_data_reverse = torch.flip(input_data, dims=[1])
 
-    encoded_output, decoded_output, forward_output = model.forward(input_data)
+    engine = InferenceEngine(model, max_batch_size=input_data.shape[0], profile=True)
+    decoded_output, forward_output = engine.run(input_data)
 
     reconstruction_criteria = nn.MSELoss()
     reconstrct_loss = reconstruction_criteria(
@@ -59,6 +60,10 @@ def evaluate_model(task, checkpoint_path):
 
     print("Reconstruction loss: %.6f, Future loss: %.6f" % (reconstrct_loss.item(), prediction_loss.item()))
 
+    engine_summary = engine.summary()
+    print("Inference latency: %.3f s, peak memory: %.1f MB"
+          % (engine_summary['mean_latency'], engine_summary['peak_memory'] / 2 ** 20))
+
 
 if __name__ == '__main__':
     task_test = tasks[105]
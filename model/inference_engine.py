@@ -0,0 +1,183 @@
+import sys
+import time
+from collections import deque
+
+import torch
+
+if not sys.platform.startswith('win32'):
+    import resource
+
+# torch.inference_mode arrived in PyTorch 1.9, and no_grad also skips the autograd graph in the older versions.
+inference_mode = getattr(torch, 'inference_mode', torch.no_grad)
+
+
+def reset_peak_memory(device):
+    """
+    Starts a new peak memory measurement: resets the peak allocation of the device for CUDA, or the peak resident set
+    size of the process on Linux. Elsewhere the peak of the process cannot be reset.
+
+    :param device: the device the model runs on
+    :return: None
+    """
+    if device.type == 'cuda':
+        # reset_peak_memory_stats arrived in PyTorch 1.4.
+        getattr(torch.cuda, 'reset_peak_memory_stats', torch.cuda.reset_max_memory_allocated)(device)
+    elif sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/clear_refs', 'w') as f:
+                f.write('5')
+        except OSError:
+            pass
+
+
+def get_peak_memory(device):
+    """
+    Gets the peak memory in bytes since the last reset_peak_memory: the peak allocation of the device for CUDA, or the
+    peak resident set size of the process for CPU. On CPU outside Linux, the peak is the one of the whole process.
+
+    :param device: the device the model runs on
+    :return: the peak memory in bytes, or 0 if it is unavailable
+    """
+    if device.type == 'cuda':
+        return torch.cuda.max_memory_allocated(device)
+
+    if sys.platform.startswith('win32'):
+        return 0
+
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # The peak resident set size is in bytes on macOS and in kilobytes on Linux.
+    return peak_rss if sys.platform.startswith('darwin') else peak_rss * 1024
+
+
+class InferenceEngine:
+    """
+    Runs a trained CompositeModel for inference only: the model is kept in eval mode, the forward pass runs in
+    inference mode so no autograd graph is built, and the inputs and outputs live in buffers allocated once.
+
+    The latencies of the calls are kept as running aggregates and a bounded window of the recent ones. The peak memory
+    is only measured when profiling, since it costs two reads of /proc or a CUDA synchronization per call.
+    """
+
+    def __init__(self, model, max_batch_size=1, device=None, profile=False, history_size=1000):
+        """
+        The initialization of the class.
+
+        :param model: the CompositeModel to run
+        :param max_batch_size: the largest number of the trajectories in one call
+        :param device: the device to run the model on, or None to keep the device of the model
+        :param profile: whether to measure the peak memory of each call and wait for CUDA before timing it
+        :param history_size: the number of the recent latencies kept in latencies
+        """
+        if device is None:
+            device = next(model.parameters()).device
+
+        self.model = model.to(device).eval()
+        self.device = device
+        self.max_batch_size = max_batch_size
+
+        self.input_buffer = torch.zeros(max_batch_size, model.input_sequence_length, model.input_size, device=device)
+        self.decoded_buffer = torch.zeros(max_batch_size, model.input_sequence_length, model.input_size, device=device)
+        self.forward_buffer = torch.zeros(max_batch_size, model.future_sequence_length, model.input_size,
+                                          device=device)
+
+        self.profile = profile
+        self.num_calls = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.peak_memory = 0
+        self.latencies = deque(maxlen=history_size)
+
+    def run(self, input_data):
+        """
+        Runs the model on a batch of normalized input sequences.
+
+        The returned tensors are views of the output buffers, which are overwritten by the next call.
+
+        :param input_data: a (N, input sequence length, input size) tensor with N at most max_batch_size
+        :return: the decoded output and the forward output of the model
+        """
+        batch_size = self._check_batch_size(input_data)
+        start_time = self._start_timing()
+
+        with inference_mode():
+            self.input_buffer[:batch_size].copy_(input_data)
+            _, decoded_output, forward_output = self.model.forward(self.input_buffer[:batch_size])
+            self.decoded_buffer[:batch_size].copy_(decoded_output)
+            self.forward_buffer[:batch_size].copy_(forward_output)
+
+        self._stop_timing(start_time)
+
+        return self.decoded_buffer[:batch_size], self.forward_buffer[:batch_size]
+
+    def run_future(self, input_data):
+        """
+        Runs only the future prediction of the model on a batch of normalized input sequences.
+
+        The returned tensor is a view of the output buffer, which is overwritten by the next call.
+
+        :param input_data: a (N, input sequence length, input size) tensor with N at most max_batch_size
+        :return: the forward output of the model
+        """
+        batch_size = self._check_batch_size(input_data)
+        start_time = self._start_timing()
+
+        with inference_mode():
+            self.input_buffer[:batch_size].copy_(input_data)
+            forward_output = self.model.predict_future(self.input_buffer[:batch_size])
+            self.forward_buffer[:batch_size].copy_(forward_output)
+
+        self._stop_timing(start_time)
+
+        return self.forward_buffer[:batch_size]
+
+    def _check_batch_size(self, input_data):
+        batch_size = input_data.shape[0]
+
+        if batch_size > self.max_batch_size:
+            raise ValueError("The batch size %d exceeds the maximum batch size %d."
+                             % (batch_size, self.max_batch_size))
+
+        return batch_size
+
+    def _start_timing(self):
+        if self.profile:
+            reset_peak_memory(self.device)
+
+        return time.perf_counter()
+
+    def _stop_timing(self, start_time):
+        if self.profile and self.device.type == 'cuda':
+            torch.cuda.synchronize(self.device)
+
+        latency = time.perf_counter() - start_time
+        self.num_calls += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.latencies.append(latency)
+
+        if self.profile:
+            self.peak_memory = max(self.peak_memory, get_peak_memory(self.device))
+
+    def summary(self):
+        """
+        Summarizes the latencies and the peak memory of all calls so far. Without profiling, the latencies on CUDA only
+        cover the launch of the kernels.
+
+        :return: a dictionary of the statistics, whose peak memory is None without profiling
+        """
+        return {
+            'num_calls': self.num_calls,
+            'mean_latency': self.total_latency / self.num_calls if self.num_calls else 0.0,
+            'max_latency': self.max_latency,
+            'peak_memory': self.peak_memory if self.profile else None
+        }
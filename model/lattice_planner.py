@@ -0,0 +1,182 @@
+import heapq
+import math
+import time
+
+from model.maze import Area, MazePlanner, Node, make_occupancy_grid
+from model.plan_result import PlanResult
+from model.planner import is_over_budget, path_to_policy
+from model.samplers import LATTICE_DIRECTIONS
+
+
+class LatticePlanner(MazePlanner):
+    """
+    A deterministic alternative to the random route graphs: A* over the space-time lattice (x, y, t) the agent moves
+    on, where each move goes to one of the 8 neighbours, or stays with allow_wait, and lasts step_size time steps.
+
+    The moves are checked against the same occupancy grid of the walls and the predicted obstacle as the planners, at
+    the time step when they are taken. The cost is the number of the moves, and the heuristic is the number of the
+    moves to the target ignoring the obstacles, so the path reaches the target as early as possible. Beyond the
+    prediction the grid no longer changes, so the states of the later moves are merged with those of the first move
+    past the prediction.
+    """
+
+    def __init__(self, task=None, checkpoint_path=None, predictor=None, load_predictor=True, allow_wait=True,
+                 max_moves=60):
+        """
+        The initialization of the class.
+
+        :param task: the task of the predictor, as in get_predictor
+        :param checkpoint_path: the checkpoint of the predictor, as in get_predictor
+        :param predictor: a loaded Predictor, as in get_predictor
+        :param load_predictor: whether to load the predictor, as in get_predictor
+        :param allow_wait: whether the agent may stay for a move
+        :param max_moves: the largest number of the moves of a path
+        """
+        super().__init__(task=task, checkpoint_path=checkpoint_path, predictor=predictor, load_predictor=load_predictor)
+        self.allow_wait = allow_wait
+        self.max_moves = max_moves
+        self.occupancy_grid = make_occupancy_grid()
+        self.directions = LATTICE_DIRECTIONS + [(0, 0)] if allow_wait else LATTICE_DIRECTIONS
+
+        # The first move starting past the prediction, from which the grid is the same at every move.
+        self.last_move = int(math.ceil(self.occupancy_grid.horizon / self.step_size))
+
+    def heuristic(self, node):
+        """
+        Gets the number of the moves from the given node to the target ignoring the obstacles, which is a lower bound
+        since each move changes x and y by at most one step.
+
+        :param node: a node of the lattice
+        :return: the number of the moves
+        """
+        distance_x = max(self.target.min_x - node.x, 0, node.x - self.target.max_x)
+        distance_y = max(self.target.min_y - node.y, 0, node.y - self.target.max_y)
+
+        return int(math.ceil(max(distance_x, distance_y) / self.agent_step))
+
+    def plan_prediction(self, prediction, time_budget=None, max_iterations=None):
+        """
+        Plans a route around the given predicted positions of the obstacle.
+
+        Without a budget, the search goes on until the target is reached or no state is left, and the policy of the
+        result is None in the latter case. With a time or iteration budget, it stops when the budget runs out and
+        falls back to the path to the expanded node closest to the target.
+
+        :param prediction: the predicted positions x of the obstacle at each time step
+        :param time_budget: the wall-clock seconds of the call, or None
+        :param max_iterations: the largest number of the expanded states, or None
+        :return: a PlanResult
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + time_budget if time_budget is not None else None
+        anytime = time_budget is not None or max_iterations is not None
+        self.occupancy_grid.set_prediction(prediction)
+
+        # The states are (node, move), where the move is capped at last_move.
+        start_state = (self.origin, 0)
+        parents = {start_state: None}
+        num_moves_of = {start_state: 0}
+        route_dict = {self.origin: set()}
+        queue = [(self.heuristic(self.origin), 0, 0, start_state)]
+        closed = set()
+        best_state = start_state
+        best_key = (self.target.distance_to_node(self.origin.x, self.origin.y), 0)
+        goal_state = None
+        num_iterations = 0
+        counter = 0
+
+        while queue:
+            if anytime and is_over_budget(deadline, num_iterations, max_iterations):
+                break
+
+            _, num_moves, _, state = heapq.heappop(queue)
+
+            if state in closed:
+                continue
+
+            closed.add(state)
+            num_iterations += 1
+            node, move = state
+
+            if self.target.interfere_node(node.x, node.y):
+                goal_state = state
+                break
+
+            key = (self.target.distance_to_node(node.x, node.y), num_moves)
+
+            if key < best_key:
+                best_key = key
+                best_state = state
+
+            if num_moves >= self.max_moves:
+                continue
+
+            valid = self.occupancy_grid.valid_moves(
+                start_x=[node.x] * len(self.directions),
+                start_y=[node.y] * len(self.directions),
+                dir_x=[dir_x for dir_x, _ in self.directions],
+                dir_y=[dir_y for _, dir_y in self.directions],
+                start_step=[num_moves * self.step_size] * len(self.directions),
+                step_size=self.step_size
+            )
+            next_move = min(move + 1, self.last_move)
+
+            for (dir_x, dir_y), v in zip(self.directions, valid):
+                if not v:
+                    continue
+
+                child = Node(node.x + dir_x * self.agent_step, node.y + dir_y * self.agent_step)
+                child_state = (child, next_move)
+
+                # Only the merged states past the prediction can be reached again in fewer moves.
+                if num_moves_of.get(child_state, self.max_moves + 1) <= num_moves + 1:
+                    continue
+
+                parents[child_state] = state
+                num_moves_of[child_state] = num_moves + 1
+                route_dict[node].add(child)
+                route_dict.setdefault(child, set())
+                counter += 1
+                heapq.heappush(queue, (num_moves + 1 + self.heuristic(child), num_moves + 1, counter, child_state))
+
+        search_time = time.perf_counter()
+        found = goal_state is not None
+        end_state = goal_state if found else best_state
+        path = []
+        state = end_state
+
+        while state is not None:
+            path.append(state[0])
+            state = parents[state]
+
+        path.reverse()
+        policy = path_to_policy(path) if found or anytime else None
+        milestone_steps = [index * self.step_size for index in range(len(path))]
+        danger_obstacles = [Area(float(prediction[min(step, len(prediction) - 1)]), 0, self.obstacle_width,
+                                 self.obstacle_thickness)
+                            for milestone, step in zip(path, milestone_steps)
+                            if self.obstacle_range.interfere_node(milestone.x, milestone.y)]
+        end_time = time.perf_counter()
+
+        return PlanResult(
+            origin=self.origin,
+            route_dict=route_dict,
+            path=path,
+            policy=policy,
+            found=found,
+            prediction=prediction,
+            milestone_steps=milestone_steps,
+            danger_obstacles=danger_obstacles,
+            walls=self.walls,
+            target=self.target,
+            obstacle_range=self.obstacle_range,
+            map_size=self.map_size,
+            timings={
+                'prediction': 0.0,
+                'search': search_time - start_time,
+                'path': end_time - search_time,
+                'total': end_time - start_time
+            },
+            num_iterations=num_iterations,
+            num_relaxations=counter
+        )
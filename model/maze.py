@@ -0,0 +1,149 @@
+import math
+import time
+from collections import namedtuple
+
+from model.occupancy_grid import OccupancyGrid
+from model.predictor import Predictor
+from task_management.task_list import tasks
+
+Node = namedtuple('Node', ['x', 'y'])
+
+
+class Area:
+    def __init__(self, center_x, center_y, width_x, width_y):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.x_width = width_x
+        self.y_width = width_y
+        self.min_x = self.center_x - width_x / 2
+        self.min_y = self.center_y - width_y / 2
+        self.max_x = self.center_x + width_x / 2
+        self.max_y = self.center_y + width_y / 2
+
+    def interfere_node(self, x, y):
+        if self.min_x < x < self.max_x and self.min_y < y < self.max_y:
+            return True
+        else:
+            return False
+
+    def distance_to_node(self, x, y):
+        return math.hypot(max(self.min_x - x, 0, x - self.max_x), max(self.min_y - y, 0, y - self.max_y))
+
+
+# The maze all the planners plan in: the half side length of the map, the distance between two positions of the
+# agent, the time steps of a move, the size of the obstacle, the inflated walls, the target, the range the obstacle
+# moves in and the start of the agent.
+MAP_SIZE = 12
+STEP_RESOLUTION = 0.25
+STEP_SIZE = 10
+AGENT_STEP = STEP_RESOLUTION * STEP_SIZE
+OBSTACLE_WIDTH = 10
+OBSTACLE_THICKNESS = 5
+WALLS = [Area(-8, 7.5, 12, 5), Area(8, -7.5, 12, 5)]
+TARGET = Area(-8, 11, 8, 2)
+OBSTACLE_RANGE = Area(0, 0, MAP_SIZE * 2 + 4, 5)
+ORIGIN = Node(2, -11)
+
+
+def reached_goal(x, y):
+    """
+    Checks the success of the experiments: the agent has gone past the left end of the upper wall into the top of the
+    maze. The experiments check it at the end of every move.
+
+    :param x: the position x of the agent
+    :param y: the position y of the agent
+    :return: True if the agent has reached the goal, False otherwise
+    """
+    return x < -4 and y > 10
+
+
+def make_occupancy_grid(obstacle_prediction=None):
+    """
+    Makes the occupancy grid of the maze.
+
+    :param obstacle_prediction: the predicted positions x of the obstacle at each time step, or None for the walls only
+    :return: the OccupancyGrid
+    """
+    return OccupancyGrid(
+        map_size=MAP_SIZE,
+        resolution=STEP_RESOLUTION,
+        walls=WALLS,
+        obstacle_range=OBSTACLE_RANGE,
+        obstacle_width=OBSTACLE_WIDTH,
+        obstacle_thickness=OBSTACLE_THICKNESS,
+        obstacle_prediction=obstacle_prediction
+    )
+
+
+def get_predictor(task=None, checkpoint_path=None, predictor=None, load_predictor=True):
+    """
+    Gets the predictor of a planner.
+
+    :param task: the task of the predictor, or None for tasks[105]
+    :param checkpoint_path: the checkpoint of the predictor, or None for the one of the task in data/checkpoints
+    :param predictor: a loaded Predictor, which replaces task and checkpoint_path
+    :param load_predictor: whether to load the predictor, which only plan needs and plan_prediction does not
+    :return: the Predictor, or None if it is neither given nor loaded
+    """
+    if predictor is None and load_predictor:
+        if task is None:
+            task = tasks[105]
+
+        if checkpoint_path is None:
+            checkpoint_path = '../data/checkpoints/checkpoint_' + task.task_name + '.pt'
+
+        predictor = Predictor(task=task, checkpoint_path=checkpoint_path)
+
+    return predictor
+
+
+class MazePlanner:
+    """
+    The base of the planners kept alive across plans, which hold the predictor and the maze, and predict the obstacle
+    before planning around the prediction with the plan_prediction of the subclass.
+    """
+
+    map_size = MAP_SIZE
+    step_resolution = STEP_RESOLUTION
+    step_size = STEP_SIZE
+    agent_step = AGENT_STEP
+    obstacle_width = OBSTACLE_WIDTH
+    obstacle_thickness = OBSTACLE_THICKNESS
+    walls = WALLS
+    target = TARGET
+    obstacle_range = OBSTACLE_RANGE
+    origin = ORIGIN
+
+    def __init__(self, task=None, checkpoint_path=None, predictor=None, load_predictor=True):
+        """
+        The initialization of the class.
+
+        :param task: the task of the predictor, as in get_predictor
+        :param checkpoint_path: the checkpoint of the predictor, as in get_predictor
+        :param predictor: a loaded Predictor, as in get_predictor
+        :param load_predictor: whether to load the predictor, as in get_predictor
+        """
+        self.predictor = get_predictor(task=task, checkpoint_path=checkpoint_path, predictor=predictor,
+                                       load_predictor=load_predictor)
+
+    def plan(self, trajectory, time_budget=None, max_iterations=None):
+        """
+        Predicts the obstacle from its observed positions and plans a route.
+
+        :param trajectory: the observed positions x of the obstacle
+        :param time_budget: the wall-clock seconds of the whole call, or None
+        :param max_iterations: the largest number of the iterations of plan_prediction, or None
+        :return: a PlanResult
+        """
+        start_time = time.perf_counter()
+        prediction = self.predictor.predict_future(trajectory)[0, :, 0].detach().numpy()
+        prediction_time = time.perf_counter() - start_time
+
+        if time_budget is not None:
+            time_budget -= prediction_time
+
+        result = self.plan_prediction(prediction, time_budget=time_budget, max_iterations=max_iterations)
+        result.timings['prediction'] = prediction_time
+        result.timings['total'] += prediction_time
+
+        return result
@@ -0,0 +1,110 @@
+import numpy as np
+
+
+class OccupancyGrid:
+    """
+    A space-time occupancy grid of the maze precomputed from the walls and the predicted obstacle positions.
+
+    The cell [t, i, j] is True if the agent cannot stay at the position (-map_size + i * resolution,
+    -map_size + j * resolution) at the time step t. The last time slice covers all time steps beyond the prediction,
+    where the whole range of the obstacle is blocked.
+    """
+
+    def __init__(self, map_size, resolution, walls, obstacle_range, obstacle_width, obstacle_thickness,
+                 obstacle_prediction=None, horizon=100):
+        """
+        The initialization of the class.
+
+        :param map_size: the half side length of the map
+        :param resolution: the distance between two adjacent cells
+        :param walls: the list of the areas of the static walls
+        :param obstacle_range: the area where the moving obstacle can be
+        :param obstacle_width: the width of the moving obstacle along x
+        :param obstacle_thickness: the width of the moving obstacle along y
+        :param obstacle_prediction: the predicted positions x of the obstacle center at each time step, or None if
+                                    the obstacle is not predicted
+        :param horizon: the number of the time steps covered by the prediction
+        """
+        self.map_size = map_size
+        self.resolution = resolution
+        self.horizon = horizon
+        self.obstacle_width = obstacle_width
+        self.obstacle_thickness = obstacle_thickness
+        self.num_cells = int(round(2 * map_size / resolution)) + 1
+
+        positions = -map_size + np.arange(self.num_cells) * resolution
+        self.grid_x, self.grid_y = np.meshgrid(positions, positions, indexing='ij')
+
+        self.static_occupancy = np.zeros((self.num_cells, self.num_cells), dtype=bool)
+
+        for wall in walls:
+            self.static_occupancy |= self._interfere(wall.min_x, wall.max_x, wall.min_y, wall.max_y, self.grid_x,
+                                                     self.grid_y)
+
+        self.band = self._interfere(obstacle_range.min_x, obstacle_range.max_x, obstacle_range.min_y,
+                                    obstacle_range.max_y, self.grid_x, self.grid_y)
+
+        self.occupancy = np.zeros((horizon + 1, self.num_cells, self.num_cells), dtype=bool)
+        self.occupancy[horizon] = self.band | self.static_occupancy
+        self.set_prediction(obstacle_prediction)
+
+    def set_prediction(self, obstacle_prediction):
+        """
+        Replaces the predicted obstacle positions, keeping the walls and the range of the obstacle.
+
+        :param obstacle_prediction: the predicted positions x of the obstacle center at each time step, or None if
+                                    the obstacle is not predicted
+        :return: None
+        """
+        self.occupancy[:self.horizon] = self.static_occupancy
+
+        if obstacle_prediction is not None:
+            centers = np.asarray(obstacle_prediction, dtype=np.float64).reshape(-1)[:self.horizon, None, None]
+            obstacle = self._interfere(centers - self.obstacle_width / 2, centers + self.obstacle_width / 2,
+                                       -self.obstacle_thickness / 2, self.obstacle_thickness / 2, self.grid_x,
+                                       self.grid_y)
+            self.occupancy[:centers.shape[0]] |= self.band & obstacle
+
+    @staticmethod
+    def _interfere(min_x, max_x, min_y, max_y, x, y):
+        return (min_x < x) & (x < max_x) & (min_y < y) & (y < max_y)
+
+    def is_valid_move(self, start_x, start_y, dir_x, dir_y, start_step, step_size):
+        """
+        Checks all sub-steps of a move at once. The end position itself is not checked, which is left to the move
+        starting from it.
+
+        :param start_x: the position x where the move starts
+        :param start_y: the position y where the move starts
+        :param dir_x: the direction x of the move, which is -1, 0 or 1
+        :param dir_y: the direction y of the move, which is -1, 0 or 1
+        :param start_step: the time step when the move starts
+        :param step_size: the number of the sub-steps of the move
+        :return: True if the move is collision-free, False otherwise
+        """
+        return bool(self.valid_moves([start_x], [start_y], [dir_x], [dir_y], [start_step], step_size)[0])
+
+    def valid_moves(self, start_x, start_y, dir_x, dir_y, start_step, step_size):
+        """
+        Checks a batch of moves against the map bounds, the walls and the predicted obstacle at once.
+
+        :param start_x: an array of the positions x where the moves start
+        :param start_y: an array of the positions y where the moves start
+        :param dir_x: an array of the directions x of the moves
+        :param dir_y: an array of the directions y of the moves
+        :param start_step: an array of the time steps when the moves start
+        :param step_size: the number of the sub-steps of each move
+        :return: a boolean array which is True for the collision-free moves
+        """
+        sub_steps = np.arange(step_size)
+        index_x = np.rint((np.asarray(start_x) + self.map_size) / self.resolution).astype(int)[:, None] \
+            + np.asarray(dir_x, dtype=int)[:, None] * sub_steps
+        index_y = np.rint((np.asarray(start_y) + self.map_size) / self.resolution).astype(int)[:, None] \
+            + np.asarray(dir_y, dtype=int)[:, None] * sub_steps
+        time_steps = np.minimum(np.asarray(start_step, dtype=int)[:, None] + sub_steps, self.horizon)
+
+        in_bounds = (index_x >= 0) & (index_x < self.num_cells) & (index_y >= 0) & (index_y < self.num_cells)
+        blocked = self.occupancy[time_steps, np.clip(index_x, 0, self.num_cells - 1),
+                                 np.clip(index_y, 0, self.num_cells - 1)]
+
+        return (in_bounds & ~blocked).all(axis=1)
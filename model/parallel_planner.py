@@ -0,0 +1,201 @@
+import os
+import random
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from model.maze import get_predictor
+from model.rrg_planner import RRGPlanner
+
+# What a worker sends back for one tree: its seed, the (number of moves, 2) array of the policy or None, whether it
+# reaches the target, the number of the nodes and of the sampling iterations, and the seconds spent planning.
+TreeReply = namedtuple('TreeReply', ['seed', 'policy', 'found', 'num_nodes', 'num_iterations', 'plan_time'])
+
+# The planner of the worker process, built once by _init_worker.
+_worker_planner = None
+
+
+def _init_worker(planner_kwargs):
+    global _worker_planner
+
+    _worker_planner = RRGPlanner(load_predictor=False, rng=random.Random(), **planner_kwargs)
+
+
+def _plan_tree(shm_name, prediction_length, seed, time_budget, max_iterations):
+    # The prediction is read in place from the block of the parent, which outlives the task, and the byte after it is
+    # set by the parent when the tree is no longer needed.
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    try:
+        prediction = np.ndarray((prediction_length,), dtype=np.float64, buffer=shm.buf)
+        stop_index = prediction.nbytes
+        _worker_planner.sampler.rng.seed(seed)
+        _worker_planner.reset_roadmap()
+        result = _worker_planner.plan_prediction(prediction, time_budget=time_budget, max_iterations=max_iterations,
+                                                 should_stop=lambda: shm.buf[stop_index] != 0)
+        del prediction
+    finally:
+        shm.close()
+
+    policy = None if result.policy is None else np.array(result.policy, dtype=np.int8).reshape(-1, 2)
+
+    return TreeReply(seed=seed, policy=policy, found=result.found, num_nodes=result.num_nodes,
+                     num_iterations=result.num_iterations, plan_time=result.timings['total'])
+
+
+def _reply_key(reply):
+    # The trees reaching the target first, then the shortest policies, then the smallest seeds, so that the chosen tree
+    # does not depend on which worker finishes first.
+    return not reply.found, len(reply.policy) if reply.policy is not None else float('inf'), reply.seed
+
+
+class ParallelPlanner:
+    """
+    Grows independent seeded route graphs in a pool of worker processes against the same prediction of the obstacle.
+
+    The prediction is made once in the parent and written into a shared memory block, which the workers read in place
+    instead of receiving a copy with each tree. The block ends with a stop byte, which the workers check while
+    sampling. Each tree is planned by the RRGPlanner of its worker from an empty
+    roadmap, so the trees only differ by their seeds.
+    """
+
+    def __init__(self, num_workers=None, task=None, checkpoint_path=None, predictor=None, load_predictor=True,
+                 **planner_kwargs):
+        """
+        The initialization of the class, which starts the workers.
+
+        :param num_workers: the number of the worker processes, or None for the number of the CPUs
+        :param task: the task of the predictor, as in get_predictor
+        :param checkpoint_path: the checkpoint of the predictor, as in get_predictor
+        :param predictor: a loaded Predictor, as in get_predictor
+        :param load_predictor: whether to load the predictor, as in get_predictor
+        :param planner_kwargs: the other arguments of the RRGPlanner of each worker
+        """
+        self.predictor = get_predictor(task=task, checkpoint_path=checkpoint_path, predictor=predictor,
+                                       load_predictor=load_predictor)
+        self.num_workers = num_workers if num_workers is not None else os.cpu_count()
+        self.executor = ProcessPoolExecutor(max_workers=self.num_workers, initializer=_init_worker,
+                                            initargs=(planner_kwargs,))
+
+        # The trees still running, including those stopping in the background after the 'first' mode.
+        self.running = set()
+
+    def plan(self, trajectory, num_trees=None, mode='first', seed=None, time_budget=None, max_iterations=None):
+        """
+        Predicts the obstacle from its observed positions and plans with several trees.
+
+        :param trajectory: the observed positions x of the obstacle
+        :param num_trees: the number of the trees, or None for the number of the workers
+        :param mode: 'first' or 'best', as in plan_prediction
+        :param seed: the seed of the first tree, incremented for each of the others, or None for a random one
+        :param time_budget: the wall-clock seconds of each tree, or None
+        :param max_iterations: the largest number of the sampling iterations of each tree, or None
+        :return: the TreeReply of the chosen tree
+        """
+        prediction = self.predictor.predict_future(trajectory)[0, :, 0].detach().numpy()
+
+        return self.plan_prediction(prediction, num_trees=num_trees, mode=mode, seed=seed, time_budget=time_budget,
+                                    max_iterations=max_iterations)
+
+    def plan_prediction(self, prediction, num_trees=None, mode='first', seed=None, time_budget=None,
+                        max_iterations=None):
+        """
+        Plans around the given predicted positions of the obstacle with several trees.
+
+        In 'first' mode, the reply of the first tree reaching the target is returned as soon as it arrives. The other
+        trees are cancelled if they have not started, and told to stop sampling through the stop byte otherwise. In
+        'best' mode, all the trees are waited for and the shortest policy reaching the target is returned. When no tree
+        reaches the target, the best partial policy is returned.
+
+        :param prediction: the predicted positions x of the obstacle at each time step
+        :param num_trees: the number of the trees, or None for the number of the workers
+        :param mode: 'first' or 'best'
+        :param seed: the seed of the first tree, incremented for each of the others, or None for a random one
+        :param time_budget: the wall-clock seconds of each tree, or None
+        :param max_iterations: the largest number of the sampling iterations of each tree, or None
+        :return: the TreeReply of the chosen tree
+        """
+        if mode not in ('first', 'best'):
+            raise ValueError("Unknown mode: %s." % mode)
+
+        if num_trees is None:
+            num_trees = self.num_workers
+
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+
+        prediction = np.ascontiguousarray(prediction, dtype=np.float64).reshape(-1)
+        shm = shared_memory.SharedMemory(create=True, size=prediction.nbytes + 1)
+        np.ndarray(prediction.shape, dtype=np.float64, buffer=shm.buf)[:] = prediction
+        shm.buf[prediction.nbytes] = 0
+
+        futures = [self.executor.submit(_plan_tree, shm.name, len(prediction), seed + k, time_budget, max_iterations)
+                   for k in range(num_trees)]
+        stop = self._release_when_done(shm, prediction.nbytes, futures)
+
+        replies = []
+        pending = set(futures)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            replies += [future.result() for future in done]
+
+            if mode == 'first' and any(reply.found for reply in replies):
+                for future in pending:
+                    future.cancel()
+
+                stop()
+                break
+
+        return min(replies, key=_reply_key)
+
+    def wait_idle(self):
+        """
+        Waits for the trees left running in the background.
+
+        :return: None
+        """
+        wait(list(self.running))
+
+    def _release_when_done(self, shm, stop_index, futures):
+        # The block is released by the last future to finish, and the returned function sets its stop byte unless it
+        # has been released already.
+        lock = threading.Lock()
+        remaining = [len(futures)]
+        self.running.update(futures)
+
+        def release(future):
+            with lock:
+                self.running.discard(future)
+                remaining[0] -= 1
+
+                if remaining[0] == 0:
+                    shm.close()
+                    shm.unlink()
+
+        def stop():
+            with lock:
+                if remaining[0]:
+                    shm.buf[stop_index] = 1
+
+        for future in futures:
+            future.add_done_callback(release)
+
+        return stop
+
+    def close(self):
+        """
+        Stops the workers after the trees in progress.
+
+        :return: None
+        """
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,53 @@
+class PlanResult:
+    """
+    The outcome of a planner call: the route graph, the chosen path and its policy, the areas of the maze needed to
+    draw them, and the time spent in each phase.
+    """
+
+    def __init__(self, origin, route_dict, path, policy, found, prediction=None, milestone_steps=None,
+                 danger_obstacles=None, walls=None, target=None, obstacle_range=None, map_size=12, timings=None,
+                 num_iterations=0, num_relaxations=0, sample_counts=None):
+        """
+        The initialization of the class.
+
+        :param origin: the start node
+        :param route_dict: the route graph as a dictionary from every node to the set of the nodes it leads to
+        :param path: the list of the nodes from the origin to the end of the chosen path
+        :param policy: the list of the moves [dx, dy] along the path, or None if the path is not collision-free
+        :param found: whether the path reaches the target and is collision-free
+        :param prediction: the predicted positions x of the obstacle, or None for the baseline
+        :param milestone_steps: the time step at which the agent reaches each node of the path
+        :param danger_obstacles: the predicted areas of the obstacle when the path crosses its range
+        :param walls: the areas of the inflated walls
+        :param target: the area of the target
+        :param obstacle_range: the area the obstacle moves in
+        :param map_size: the half width of the map
+        :param timings: the dictionary of the seconds spent in each phase
+        :param num_iterations: the number of the sampling iterations
+        :param num_relaxations: the number of the times the depth of a node in the route graph was set or shortened
+        :param sample_counts: the dictionary of the counters of the sampler
+        """
+        self.origin = origin
+        self.route_dict = route_dict
+        self.path = path
+        self.policy = policy
+        self.found = found
+        self.prediction = prediction
+        self.milestone_steps = milestone_steps if milestone_steps is not None else []
+        self.danger_obstacles = danger_obstacles if danger_obstacles is not None else []
+        self.walls = walls if walls is not None else []
+        self.target = target
+        self.obstacle_range = obstacle_range
+        self.map_size = map_size
+        self.timings = timings if timings is not None else {}
+        self.num_iterations = num_iterations
+        self.num_relaxations = num_relaxations
+        self.sample_counts = sample_counts if sample_counts is not None else {}
+
+    @property
+    def num_nodes(self):
+        return len(self.route_dict)
+
+    def __repr__(self):
+        return "PlanResult(found=%s, nodes=%d, path_steps=%d, total_time=%.3f)" % (
+            self.found, self.num_nodes, len(self.path) - 1, self.timings.get('total', float('nan')))
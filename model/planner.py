@@ -1,102 +1,131 @@
-import random
-from math import sqrt
-from collections import namedtuple, deque
-
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
-
-from model.predictor import Predictor
-from task_management.task_list import tasks
-
-
-class Area:
-    def __init__(self, center_x, center_y, width_x, width_y):
-        self.center_x = center_x
-        self.center_y = center_y
-        self.x_width = width_x
-        self.y_width = width_y
-        self.min_x = self.center_x - width_x / 2
-        self.min_y = self.center_y - width_y / 2
-        self.max_x = self.center_x + width_x / 2
-        self.max_y = self.center_y + width_y / 2
-
-    def interfere_node(self, x, y):
-        if self.min_x < x < self.max_x and self.min_y < y < self.max_y:
-            return True
+import time
+from collections import deque
+
+from model.maze import (AGENT_STEP, MAP_SIZE, OBSTACLE_RANGE, OBSTACLE_THICKNESS, OBSTACLE_WIDTH, ORIGIN, STEP_SIZE,
+                        TARGET, WALLS, Area, Node, get_predictor, make_occupancy_grid)
+from model.plan_result import PlanResult
+from model.route_graph import RouteGraph
+from model.samplers import choose_direction, make_sampler
+from model.spatial_index import make_spatial_index
+
+
+def path_to_policy(path):
+    policy = []
+
+    for i in range(len(path) - 1):
+        if path[i + 1].x < path[i].x:
+            policy_unit_x = -1
+        elif path[i + 1].x > path[i].x:
+            policy_unit_x = 1
         else:
-            return False
-
-
-def choose_direction(start_x, start_y, end_x, end_y):
-    if start_x < end_x and abs(start_x - end_x) > 1:
-        dir_x = 1
-    elif start_x > end_x and abs(start_x - end_x) > 1:
-        dir_x = -1
-    else:
-        dir_x = 0
-
-    if start_y < end_y and abs(start_y - end_y) > 1:
-        dir_y = 1
-    elif start_y > end_y and abs(start_y - end_y) > 1:
-        dir_y = -1
-    else:
-        dir_y = 0
-
-    return dir_x, dir_y
-
-
-def planner(trajectory):
-    map_size = 12
-    step_resolution = 0.25
-    step_size = 10
-    obstacle_width = 10
-    obstacle_thickness = 5
-    agent_step = step_resolution * step_size
-    plt.figure()
-    currentAxis = plt.gca()
-    plt.axis([-map_size, map_size, -map_size, map_size])
-    plt.title("RRG Route Map for the Maze Problem")
-    plt.xlabel('X')
-    plt.ylabel('Y')
-    Node = namedtuple('Node', ['x', 'y'])
-    task_test = tasks[105]
-    predictor = Predictor(
-        task=task_test,
-        checkpoint_path='../data/checkpoints/checkpoint_' + task_test.task_name + '.pt'
-    )
-    _, obstacle_pos_prediction = predictor.predict(trajectory)
+            policy_unit_x = 0
 
-    def is_valid_move(start_node, dir_x, dir_y):
-        global obstacle
-        end_x = start_node.x
-        end_y = start_node.y
-        start_step = calculate_step(start_node)
+        if path[i + 1].y < path[i].y:
+            policy_unit_y = -1
+        elif path[i + 1].y > path[i].y:
+            policy_unit_y = 1
+        else:
+            policy_unit_y = 0
+
+        policy.append([policy_unit_x, policy_unit_y])
 
-        for s in range(step_size):
-            if (end_x < -map_size) or (end_x > map_size) or (end_y < -map_size) or (end_y > map_size):
-                return False
+    return policy
 
-            for obstacle in walls:
-                if obstacle.interfere_node(end_x, end_y):
-                    return False
 
-            if obstacle_range.interfere_node(end_x, end_y):
-                cur_step = start_step + s
+def check_path(path, milestone_steps, prediction, obstacle_range, obstacle_width, obstacle_thickness):
+    """
+    Checks the milestones of a path in the range of the obstacle: a milestone is unsafe if it is in the predicted area
+    of the obstacle at the previous milestone in the range, or if it is reached past the horizon of the prediction.
 
-                if cur_step >= 100:
-                    return False
+    :param path: the list of the nodes from the origin
+    :param milestone_steps: the time step at which the agent reaches each node of the path
+    :param prediction: the predicted positions x of the obstacle at each time step
+    :param obstacle_range: the area the obstacle moves in
+    :param obstacle_width: the width of the obstacle
+    :param obstacle_thickness: the thickness of the obstacle
+    :return: whether the path is safe, the predicted areas of the obstacle, and the first unsafe milestone or None
+    """
+    danger_obstacle = Area(0, 0, obstacle_width, obstacle_thickness)
+    danger_obstacles = []
 
-                obstacle = Area(obstacle_pos_prediction[0, cur_step, 0].item(), 0, obstacle_width, obstacle_thickness)
+    for milestone, danger_step in zip(path, milestone_steps):
+        if obstacle_range.interfere_node(milestone.x, milestone.y):
+            # Nothing is known of the obstacle past the prediction.
+            if danger_step >= len(prediction) or danger_obstacle.interfere_node(milestone.x, milestone.y):
+                return False, danger_obstacles, milestone
 
-                if obstacle.interfere_node(end_x, end_y):
-                    return False
+            danger_obstacle = Area(float(prediction[danger_step]), 0, obstacle_width, obstacle_thickness)
+            danger_obstacles.append(danger_obstacle)
 
-            end_x += dir_x * step_resolution
-            end_y += dir_y * step_resolution
+    return True, danger_obstacles, None
 
+
+def is_over_budget(deadline, num_iterations, max_iterations):
+    if deadline is not None and time.perf_counter() >= deadline:
         return True
 
-    def bfs(end_node, plot=False):
+    return max_iterations is not None and num_iterations >= max_iterations
+
+
+def planner(trajectory, index_type='grid', batch_size=1, time_budget=None, max_iterations=None, sampler='uniform',
+            rng=None, predictor=None):
+    """
+    Plans a route for the agent through the maze around the predicted obstacle.
+
+    Without a budget, the planner samples until the route graph reaches the target, and the policy of the result is
+    None if the path is not collision-free. With a time or iteration budget, it stops sampling when the budget runs
+    out, and falls back to the collision-free path to the node closest to the target when no full path is found.
+
+    :param trajectory: the observed positions x of the obstacle
+    :param index_type: the type of the spatial index of the nodes, 'grid' or 'kdtree'
+    :param batch_size: the number of the samples checked together
+    :param time_budget: the wall-clock seconds of the whole call, or None
+    :param max_iterations: the largest number of the sampling iterations, or None
+    :param sampler: the sampler of the moves, or its type for make_sampler
+    :param rng: the random.Random of the sampler made from its type, or None for the random module
+    :param predictor: a loaded Predictor, or None to load the one of get_predictor at every call
+    :return: a PlanResult
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + time_budget if time_budget is not None else None
+    anytime = time_budget is not None or max_iterations is not None
+    map_size = MAP_SIZE
+    step_size = STEP_SIZE
+    obstacle_width = OBSTACLE_WIDTH
+    obstacle_thickness = OBSTACLE_THICKNESS
+    agent_step = AGENT_STEP
+    predictor = get_predictor(predictor=predictor)
+    prediction = predictor.predict_future(trajectory)[0, :, 0].detach().numpy()
+    prediction_time = time.perf_counter()
+
+    def is_valid_move(start_node, dir_x, dir_y):
+        return occupancy_grid.is_valid_move(start_node.x, start_node.y, dir_x, dir_y,
+                                            start_step=calculate_step(start_node), step_size=step_size)
+
+    def are_valid_moves(moves):
+        if not moves:
+            return []
+
+        start_steps = [calculate_step(start_node) for start_node, _, _ in moves]
+        valid = occupancy_grid.valid_moves(
+            start_x=[start_node.x for start_node, _, _ in moves],
+            start_y=[start_node.y for start_node, _, _ in moves],
+            dir_x=[dir_x for _, dir_x, _ in moves],
+            dir_y=[dir_y for _, _, dir_y in moves],
+            start_step=start_steps,
+            step_size=step_size
+        )
+
+        return list(zip(moves, start_steps, valid))
+
+    def is_still_valid(start_node, dir_x, dir_y, start_step, valid):
+        # The edges added after a batch was checked may have shortened the depth of its start nodes.
+        if calculate_step(start_node) != start_step:
+            return is_valid_move(start_node, dir_x, dir_y)
+
+        return valid
+
+    def bfs(end_node):
         parents = {}
         finished = set()
         queue = deque()
@@ -106,14 +135,8 @@ def planner(trajectory):
             parent = queue.popleft()
             finished.add(parent)
 
-            if plot:
-                plt.plot([parent.x, ], [parent.y, ], 'o', color='gray', markersize=4)
-
             for child in route_dict[parent]:
                 if child not in finished:
-                    if plot:
-                        plt.plot([parent.x, child.x], [parent.y, child.y], color='gray')
-
                     if child not in queue:
                         queue.append(child)
                         parents[child] = parent
@@ -130,117 +153,125 @@ def planner(trajectory):
         return path
 
     def calculate_step(end_node):
-        cur_path = bfs(end_node=end_node, plot=False)
-
-        return (len(cur_path) - 1) * step_size
-
-    obstacle = Area(0, 0, obstacle_width, obstacle_thickness)
-    wall0 = Area(-8, 7.5, 12, 5)
-    wall1 = Area(8, -7.5, 12, 5)
-    walls = [wall0, wall1]
-    target = Area(-8, 11, 8, 2)
-    obstacle_range = Area(0, 0, map_size * 2 + 4, 5)
-    origin = Node(2, -11)
-    route_dict = {origin: set()}
+        return route_graph.get_depth(end_node) * step_size
+
+    def is_safe_path(path):
+        safe, danger_obstacles, _ = check_path(path, [calculate_step(milestone) for milestone in path], prediction,
+                                               obstacle_range, obstacle_width, obstacle_thickness)
+
+        return safe, danger_obstacles
+
+    def find_best_partial_path():
+        # The nodes closest to the target first, and the shallowest of the equally close ones.
+        nodes = sorted(route_dict, key=lambda node: (target.distance_to_node(node.x, node.y), calculate_step(node)))
+
+        for node in nodes:
+            path = route_graph.get_path(node)
+            safe, danger_obstacles = is_safe_path(path)
+
+            if safe:
+                return path, danger_obstacles
+
+    walls = WALLS
+    target = TARGET
+    obstacle_range = OBSTACLE_RANGE
+    occupancy_grid = make_occupancy_grid(obstacle_prediction=prediction)
+    origin = ORIGIN
+    route_graph = RouteGraph(origin)
+    route_dict = route_graph.route_dict
+    spatial_index = make_spatial_index(index_type, cell_size=agent_step,
+                                       origin_x=origin.x - agent_step / 2, origin_y=origin.y - agent_step / 2)
+    spatial_index.insert(origin)
+    sampler = make_sampler(sampler, rng=rng)
+    sampler.reset(origin=origin, map_size=map_size, agent_step=agent_step, target=target)
 
     done = False
     last_node = None
+    num_iterations = 0
 
     while not done:
-        pos_rand_x = random.uniform(-map_size, map_size)
-        pos_rand_y = random.uniform(-map_size, map_size)
-
-        min_distance = float('inf')
-        n_nearest = None
-
-        for node in route_dict.keys():
-            distance = sqrt(abs(node.x - pos_rand_x) + abs(node.y - pos_rand_y))
-
-            if min_distance > distance:
-                min_distance = distance
-                n_nearest = node
-
-        if min_distance > agent_step:
-            continue
-
-        direction_x, direction_y = choose_direction(n_nearest.x, n_nearest.y, pos_rand_x, pos_rand_y)
-
-        if not is_valid_move(n_nearest, direction_x, direction_y):
-            continue
-
-        new_node_x = n_nearest.x + direction_x * agent_step
-        new_node_y = n_nearest.y + direction_y * agent_step
-
-        new_node = Node(new_node_x, new_node_y)
-
-        if new_node in route_dict:
-            continue
-
-        route_dict[new_node] = set()
-        route_dict[n_nearest].add(new_node)
-        route_dict[new_node].add(n_nearest)
-
-        for p in route_dict.keys():
-            direction_x, direction_y = choose_direction(p.x, p.y, new_node.x, new_node.y)
-
-            if abs(p.x - new_node.x) == agent_step and abs(p.y - new_node.y) == agent_step \
-                    and is_valid_move(p, direction_x, direction_y):
-                route_dict[p].add(new_node)
-
-        if target.interfere_node(new_node_x, new_node_y):
-            last_node = new_node
-            done = True
-
-    path = bfs(end_node=last_node, plot=True)
-
-    for milestone in path:
-        if obstacle_range.interfere_node(milestone.x, milestone.y):
-            danger_step = calculate_step(milestone)
-
-            if obstacle.interfere_node(milestone.x, milestone.y):
-                return None
-
-            obstacle = Area(obstacle_pos_prediction[0, danger_step, 0].item(), 0, obstacle_width, obstacle_thickness)
-            currentAxis.add_patch(
-                Rectangle((obstacle.min_x, obstacle.min_y), obstacle.x_width, obstacle.y_width, fill=True,
-                          facecolor="blue", alpha=1))
-
-    policy = []
-
-    for i in range(len(path) - 1):
-        if path[i + 1].x < path[i].x:
-            policy_unit_x = -1
-        elif path[i + 1].x > path[i].x:
-            policy_unit_x = 1
-        else:
-            policy_unit_x = 0
-
-        if path[i + 1].y < path[i].y:
-            policy_unit_y = -1
-        elif path[i + 1].y > path[i].y:
-            policy_unit_y = 1
-        else:
-            policy_unit_y = 0
-
-        policy.append([policy_unit_x, policy_unit_y])
-
-    currentAxis.add_patch(
-        Rectangle((wall0.min_x, wall0.min_y), wall0.x_width, wall0.y_width, fill=True, facecolor="green", alpha=1))
-    currentAxis.add_patch(
-        Rectangle((wall1.min_x, wall1.min_y), wall1.x_width, wall1.y_width, fill=True, facecolor="green", alpha=1))
-    currentAxis.add_patch(
-        Rectangle((obstacle_range.min_x, obstacle_range.min_y), obstacle_range.x_width, obstacle_range.y_width,
-                  fill=True, facecolor="blue", alpha=0.2))
-    currentAxis.add_patch(
-        Rectangle((target.min_x, target.min_y), target.x_width, target.y_width, fill=True, facecolor="purple",
-                  alpha=0.5))
-
-    for i in range(1, len(path)):
-        plt.plot([path[i].x, ], [path[i].y, ], ' o', color='orange')
-        plt.plot([path[i - 1].x, path[i].x], [path[i - 1].y, path[i].y], color='orange', lw=3)
-
-    plt.plot([origin.x, ], [origin.y, ], 'rs', markersize=10)
-
-    plt.show()
-
-    return policy
+        if anytime and is_over_budget(deadline, num_iterations, max_iterations):
+            break
+
+        num_iterations += 1
+        candidates = []
+
+        for _ in range(batch_size):
+            candidate = sampler.sample(spatial_index)
+
+            if candidate is not None:
+                candidates.append(candidate)
+
+        for (n_nearest, direction_x, direction_y), start_step, valid in are_valid_moves(candidates):
+            if not is_still_valid(n_nearest, direction_x, direction_y, start_step, valid):
+                continue
+
+            new_node_x = n_nearest.x + direction_x * agent_step
+            new_node_y = n_nearest.y + direction_y * agent_step
+
+            new_node = Node(new_node_x, new_node_y)
+
+            if new_node in route_dict:
+                continue
+
+            route_graph.add_node(new_node)
+            route_graph.add_edge(n_nearest, new_node)
+            route_graph.add_edge(new_node, n_nearest)
+            spatial_index.insert(new_node)
+            sampler.add_node(new_node)
+
+            neighbours = []
+
+            for p in spatial_index.within(new_node.x, new_node.y, agent_step):
+                if abs(p.x - new_node.x) == agent_step and abs(p.y - new_node.y) == agent_step:
+                    direction_x, direction_y = choose_direction(p.x, p.y, new_node.x, new_node.y)
+                    neighbours.append((p, direction_x, direction_y))
+
+            for (p, direction_x, direction_y), start_step, valid in are_valid_moves(neighbours):
+                if is_still_valid(p, direction_x, direction_y, start_step, valid):
+                    route_graph.add_edge(p, new_node)
+
+            if target.interfere_node(new_node_x, new_node_y):
+                last_node = new_node
+                done = True
+                break
+
+    search_time = time.perf_counter()
+    found = done
+    policy = None
+
+    if done:
+        path = bfs(end_node=last_node)
+        found, danger_obstacles = is_safe_path(path)
+
+    if not found and anytime:
+        path, danger_obstacles = find_best_partial_path()
+
+    if found or anytime:
+        policy = path_to_policy(path)
+
+    end_time = time.perf_counter()
+
+    return PlanResult(
+        origin=origin,
+        route_dict=route_dict,
+        path=path,
+        policy=policy,
+        found=found,
+        prediction=prediction,
+        milestone_steps=[calculate_step(milestone) for milestone in path],
+        danger_obstacles=danger_obstacles,
+        walls=walls,
+        target=target,
+        obstacle_range=obstacle_range,
+        map_size=map_size,
+        timings={
+            'prediction': prediction_time - start_time,
+            'search': search_time - prediction_time,
+            'path': end_time - search_time,
+            'total': end_time - start_time
+        },
+        num_iterations=num_iterations,
+        num_relaxations=route_graph.num_relaxations,
+        sample_counts=sampler.get_counts()
+    )
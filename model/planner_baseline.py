@@ -1,43 +1,61 @@
-import random
-from math import sqrt
-from collections import namedtuple, deque
-
-from model.planner import Area, choose_direction
-
-
-def planner_baseline():
-    map_size = 12
-    step_resolution = 0.25
-    step_size = 10
-    obstacle_width = 10
-    obstacle_thickness = 5
-    agent_step = step_resolution * step_size
-    Node = namedtuple('Node', ['x', 'y'])
+import time
+from collections import deque
+
+from model.maze import (AGENT_STEP, MAP_SIZE, OBSTACLE_RANGE, ORIGIN, STEP_SIZE, TARGET, WALLS, Node,
+                        make_occupancy_grid)
+from model.plan_result import PlanResult
+from model.planner import is_over_budget, path_to_policy
+from model.route_graph import RouteGraph
+from model.samplers import choose_direction, make_sampler
+from model.spatial_index import make_spatial_index
+
+
+def planner_baseline(index_type='grid', batch_size=1, time_budget=None, max_iterations=None, sampler='uniform',
+                     rng=None):
+    """
+    Plans a route for the agent through the maze ignoring the obstacle, with the same budgets as planner.
+
+    :param index_type: the type of the spatial index of the nodes, 'grid' or 'kdtree'
+    :param batch_size: the number of the samples checked together
+    :param time_budget: the wall-clock seconds of the whole call, or None
+    :param max_iterations: the largest number of the sampling iterations, or None
+    :param sampler: the sampler of the moves, or its type for make_sampler
+    :param rng: the random.Random of the sampler made from its type, or None for the random module
+    :return: a PlanResult
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + time_budget if time_budget is not None else None
+    anytime = time_budget is not None or max_iterations is not None
+    map_size = MAP_SIZE
+    step_size = STEP_SIZE
+    agent_step = AGENT_STEP
 
     def is_valid_move(start_node, dir_x, dir_y):
-        global obstacle
-        end_x = start_node.x
-        end_y = start_node.y
-        start_step = calculate_step(start_node)
-
-        for s in range(step_size):
-            if (end_x < -map_size) or (end_x > map_size) or (end_y < -map_size) or (end_y > map_size):
-                return False
+        return occupancy_grid.is_valid_move(start_node.x, start_node.y, dir_x, dir_y,
+                                            start_step=calculate_step(start_node), step_size=step_size)
 
-            for obstacle in walls:
-                if obstacle.interfere_node(end_x, end_y):
-                    return False
+    def are_valid_moves(moves):
+        if not moves:
+            return []
 
-            if obstacle_range.interfere_node(end_x, end_y):
-                cur_step = start_step + s
+        start_steps = [calculate_step(start_node) for start_node, _, _ in moves]
+        valid = occupancy_grid.valid_moves(
+            start_x=[start_node.x for start_node, _, _ in moves],
+            start_y=[start_node.y for start_node, _, _ in moves],
+            dir_x=[dir_x for _, dir_x, _ in moves],
+            dir_y=[dir_y for _, _, dir_y in moves],
+            start_step=start_steps,
+            step_size=step_size
+        )
 
-                if cur_step >= 100:
-                    return False
+        return list(zip(moves, start_steps, valid))
 
-            end_x += dir_x * step_resolution
-            end_y += dir_y * step_resolution
+    def is_still_valid(start_node, dir_x, dir_y, start_step, valid):
+        # The edges added after a batch was checked may have shortened the depth of its start nodes.
+        if calculate_step(start_node) != start_step:
+            return is_valid_move(start_node, dir_x, dir_y)
 
-        return True
+        return valid
 
     def bfs(end_node):
         parents = {}
@@ -67,86 +85,102 @@ def planner_baseline():
         return path
 
     def calculate_step(end_node):
-        path = bfs(end_node=end_node)
-
-        return (len(path) - 1) * step_size
-
-    obstacle = Area(0, 0, obstacle_width, obstacle_thickness)
-    wall0 = Area(-8, 7.5, 12, 5)
-    wall1 = Area(8, -7.5, 12, 5)
-    walls = [wall0, wall1]
-    target = Area(-8, 11, 8, 2)
-    obstacle_range = Area(0, 0, map_size * 2 + 4, 5)
-    origin = Node(2, -11)
-    route_dict = {origin: set()}
+        return route_graph.get_depth(end_node) * step_size
+
+    walls = WALLS
+    target = TARGET
+    obstacle_range = OBSTACLE_RANGE
+    occupancy_grid = make_occupancy_grid()
+    origin = ORIGIN
+    route_graph = RouteGraph(origin)
+    route_dict = route_graph.route_dict
+    spatial_index = make_spatial_index(index_type, cell_size=agent_step,
+                                       origin_x=origin.x - agent_step / 2, origin_y=origin.y - agent_step / 2)
+    spatial_index.insert(origin)
+    sampler = make_sampler(sampler, rng=rng)
+    sampler.reset(origin=origin, map_size=map_size, agent_step=agent_step, target=target)
 
     done = False
     last_node = None
+    num_iterations = 0
 
     while not done:
-        pos_rand_x = random.uniform(-map_size, map_size)
-        pos_rand_y = random.uniform(-map_size, map_size)
-
-        min_distance = float('inf')
-        n_nearest = None
-
-        for node in route_dict.keys():
-            distance = sqrt(abs(node.x - pos_rand_x) + abs(node.y - pos_rand_y))
-
-            if min_distance > distance:
-                min_distance = distance
-                n_nearest = node
-
-        if min_distance > agent_step:
-            continue
-
-        direction_x, direction_y = choose_direction(n_nearest.x, n_nearest.y, pos_rand_x, pos_rand_y)
-
-        if not is_valid_move(n_nearest, direction_x, direction_y):
-            continue
-
-        new_node_x = n_nearest.x + direction_x * agent_step
-        new_node_y = n_nearest.y + direction_y * agent_step
-
-        new_node = Node(new_node_x, new_node_y)
-
-        if new_node in route_dict:
-            continue
-
-        route_dict[new_node] = set()
-        route_dict[n_nearest].add(new_node)
-        route_dict[new_node].add(n_nearest)
-
-        for p in route_dict.keys():
-            direction_x, direction_y = choose_direction(p.x, p.y, new_node.x, new_node.y)
-
-            if abs(p.x - new_node.x) == agent_step and abs(p.y - new_node.y) == agent_step \
-                    and is_valid_move(p, direction_x, direction_y):
-                route_dict[p].add(new_node)
-
-        if target.interfere_node(new_node_x, new_node_y):
-            last_node = new_node
-            done = True
-
-    path = bfs(end_node=last_node)
-
-    policy = []
-
-    for i in range(len(path) - 1):
-        if path[i + 1].x < path[i].x:
-            policy_unit_x = -1
-        elif path[i + 1].x > path[i].x:
-            policy_unit_x = 1
-        else:
-            policy_unit_x = 0
-
-        if path[i + 1].y < path[i].y:
-            policy_unit_y = -1
-        elif path[i + 1].y > path[i].y:
-            policy_unit_y = 1
-        else:
-            policy_unit_y = 0
-
-        policy.append([policy_unit_x, policy_unit_y])
-
-    return policy
+        if anytime and is_over_budget(deadline, num_iterations, max_iterations):
+            break
+
+        num_iterations += 1
+        candidates = []
+
+        for _ in range(batch_size):
+            candidate = sampler.sample(spatial_index)
+
+            if candidate is not None:
+                candidates.append(candidate)
+
+        for (n_nearest, direction_x, direction_y), start_step, valid in are_valid_moves(candidates):
+            if not is_still_valid(n_nearest, direction_x, direction_y, start_step, valid):
+                continue
+
+            new_node_x = n_nearest.x + direction_x * agent_step
+            new_node_y = n_nearest.y + direction_y * agent_step
+
+            new_node = Node(new_node_x, new_node_y)
+
+            if new_node in route_dict:
+                continue
+
+            route_graph.add_node(new_node)
+            route_graph.add_edge(n_nearest, new_node)
+            route_graph.add_edge(new_node, n_nearest)
+            spatial_index.insert(new_node)
+            sampler.add_node(new_node)
+
+            neighbours = []
+
+            for p in spatial_index.within(new_node.x, new_node.y, agent_step):
+                if abs(p.x - new_node.x) == agent_step and abs(p.y - new_node.y) == agent_step:
+                    direction_x, direction_y = choose_direction(p.x, p.y, new_node.x, new_node.y)
+                    neighbours.append((p, direction_x, direction_y))
+
+            for (p, direction_x, direction_y), start_step, valid in are_valid_moves(neighbours):
+                if is_still_valid(p, direction_x, direction_y, start_step, valid):
+                    route_graph.add_edge(p, new_node)
+
+            if target.interfere_node(new_node_x, new_node_y):
+                last_node = new_node
+                done = True
+                break
+
+    search_time = time.perf_counter()
+
+    if done:
+        path = bfs(end_node=last_node)
+    else:
+        # The shallowest of the nodes closest to the target.
+        path = route_graph.get_path(min(route_dict, key=lambda node: (target.distance_to_node(node.x, node.y),
+                                                                      calculate_step(node))))
+
+    policy = path_to_policy(path)
+    end_time = time.perf_counter()
+
+    return PlanResult(
+        origin=origin,
+        route_dict=route_dict,
+        path=path,
+        policy=policy,
+        found=done,
+        milestone_steps=[calculate_step(milestone) for milestone in path],
+        walls=walls,
+        target=target,
+        obstacle_range=obstacle_range,
+        map_size=map_size,
+        timings={
+            'prediction': 0.0,
+            'search': search_time - start_time,
+            'path': end_time - search_time,
+            'total': end_time - start_time
+        },
+        num_iterations=num_iterations,
+        num_relaxations=route_graph.num_relaxations,
+        sample_counts=sampler.get_counts()
+    )
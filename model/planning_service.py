@@ -0,0 +1,139 @@
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model.lattice_planner import LatticePlanner
+from model.planner_baseline import planner_baseline
+from model.rrg_planner import RRGPlanner
+
+PLANNERS = ('lstm', 'baseline', 'lattice')
+
+# What a worker sends back: the (number of moves, 2) array of the policy or None, whether it reaches the target, the
+# number of the planner calls and the seconds spent in them.
+PlanReply = namedtuple('PlanReply', ['policy', 'found', 'attempts', 'plan_time'])
+
+# The planner of the worker process, built once by _init_worker.
+_worker_planner = None
+
+
+def _init_worker(planner_name, planner_kwargs):
+    global _worker_planner
+
+    # The forked workers would otherwise share the random state of the parent and sample the same routes.
+    random.seed()
+
+    if planner_name == 'lstm':
+        _worker_planner = RRGPlanner(rng=random.Random(), **planner_kwargs)
+    elif planner_name == 'lattice':
+        _worker_planner = LatticePlanner(**planner_kwargs)
+
+
+def _ping():
+    return True
+
+
+def _plan(trajectory, time_budget, max_iterations, max_attempts, seed):
+    start_time = time.perf_counter()
+    rng = None
+
+    if seed is not None:
+        rng = random.Random(seed)
+
+        # The roadmap left by the earlier plans of the worker would change the plan of the same seed.
+        if isinstance(_worker_planner, RRGPlanner):
+            _worker_planner.reset_roadmap()
+            _worker_planner.sampler.rng.seed(seed)
+
+    policy = None
+    found = False
+    attempts = 0
+
+    while policy is None and (max_attempts is None or attempts < max_attempts):
+        attempts += 1
+
+        if _worker_planner is None:
+            result = planner_baseline(time_budget=time_budget, max_iterations=max_iterations, rng=rng)
+        else:
+            result = _worker_planner.plan(trajectory, time_budget=time_budget, max_iterations=max_iterations)
+
+        policy, found = result.policy, result.found
+
+    if policy is not None:
+        policy = np.array(policy, dtype=np.int8).reshape(-1, 2)
+
+    return PlanReply(policy=policy, found=found, attempts=attempts, plan_time=time.perf_counter() - start_time)
+
+
+class PlanningService:
+    """
+    Plans in a pool of worker processes kept alive across plans, so the control loop can go on while a plan is made.
+
+    Each worker builds its planner once when it starts, so the predictor of the LSTM planner is loaded and its roadmap
+    is kept in the worker rather than in every plan. A plan is submitted with the observed trajectory and returns a
+    future, and its policy comes back as one numpy array instead of being read move by move through a manager.
+    """
+
+    def __init__(self, planner_name='lstm', num_workers=1, **planner_kwargs):
+        """
+        The initialization of the class, which starts the workers.
+
+        :param planner_name: 'lstm' for RRGPlanner, 'baseline' for planner_baseline or 'lattice' for LatticePlanner
+        :param num_workers: the number of the worker processes
+        :param planner_kwargs: the arguments of RRGPlanner or LatticePlanner
+        """
+        if planner_name not in PLANNERS:
+            raise ValueError("Unknown planner: %s." % planner_name)
+
+        self.planner_name = planner_name
+        self.num_workers = num_workers
+        self.executor = ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker,
+                                            initargs=(planner_name, planner_kwargs))
+        self.ready = [self.executor.submit(_ping) for _ in range(num_workers)]
+
+    def submit(self, trajectory=None, time_budget=None, max_iterations=None, max_attempts=20, seed=None):
+        """
+        Submits a plan to the workers without waiting for it.
+
+        :param trajectory: the observed positions x of the obstacle, which the baseline does not need
+        :param time_budget: the wall-clock seconds of each planner call, or None
+        :param max_iterations: the largest number of the sampling iterations of each planner call, or None
+        :param max_attempts: the number of the times the planner is called until it returns a policy, or None for no
+                             limit
+        :param seed: the seed of the plan, which then starts from an empty roadmap so that it only depends on the seed
+                     and the trajectory, or None to go on with the roadmap and the random state of the worker
+        :return: a Future of the PlanReply
+        """
+        if trajectory is not None:
+            trajectory = list(trajectory)
+
+        return self.executor.submit(_plan, trajectory, time_budget, max_iterations, max_attempts, seed)
+
+    @staticmethod
+    def poll(future):
+        """
+        Gets the reply of a submitted plan if it is done.
+
+        :param future: the Future returned by submit
+        :return: the PlanReply, or None if the plan is not done yet
+        """
+        if not future.done():
+            return None
+
+        return future.result()
+
+    def close(self):
+        """
+        Stops the workers, cancelling the plans that have not started.
+
+        :return: None
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,11 +1,12 @@
 import torch
 
 from model.composite_model import CompositeModel
+from model.inference_engine import InferenceEngine, inference_mode
 from task_management.task_list import tasks
 
 
 class Predictor:
-    def __init__(self, task, checkpoint_path):
+    def __init__(self, task, checkpoint_path, max_batch_size=4096, fused_decoder=False):
         self.task = task
         self.checkpoint_path = checkpoint_path
         self.input_sequence_length = 50
@@ -18,17 +19,152 @@ class Predictor:
             input_sequence_length=self.input_sequence_length,
             future_sequence_length=self.future_sequence_length,
             num_layers=1,
-            batch_first=True
+            batch_first=True,
+            fused_decoder=fused_decoder
         )
         self.model.load_state_dict(torch.load(checkpoint_path), strict=True)
+        self.engine = InferenceEngine(self.model, max_batch_size=max_batch_size)
 
     def predict(self, x):
         trajectory = torch.tensor(x, dtype=torch.float).unsqueeze(0).unsqueeze(2)
         input_data = trajectory[:, :self.input_sequence_length, :] / self.x_limit
-        _, decoded_output, forward_output = self.model.forward(input_data)
+        decoded_output, forward_output = self.engine.run(input_data)
 
         return decoded_output * self.x_limit, forward_output * self.x_limit
 
+    def predict_future(self, x):
+        """
+        Predicts only the future trajectory of one obstacle, skipping the outputs of the reconstruction decoder.
+
+        :param x: the list of the observed positions
+        :return: the (1, future sequence length, 1) future trajectory, which is the same as the one of predict
+        """
+        trajectory = torch.tensor(x, dtype=torch.float).unsqueeze(0).unsqueeze(2)
+        input_data = trajectory[:, :self.input_sequence_length, :] / self.x_limit
+        forward_output = self.engine.run_future(input_data)
+
+        return forward_output * self.x_limit
+
+    def predict_batch(self, x, max_batch_size=None):
+        """
+        Predicts the trajectories of many obstacles with the gradients disabled.
+
+        :param x: an (N, T) array or tensor of the observed positions, where T is at least the input sequence length
+        :param max_batch_size: the largest number of the trajectories passed through the model at once, which is
+                               capped by the buffers of the inference engine
+        :return: the (N, input sequence length, 1) reconstructed and (N, future sequence length, 1) future trajectories
+        """
+        if max_batch_size is None or max_batch_size > self.engine.max_batch_size:
+            max_batch_size = self.engine.max_batch_size
+
+        trajectories = torch.as_tensor(x, dtype=torch.float)
+        input_data = trajectories[:, :self.input_sequence_length].unsqueeze(2) / self.x_limit
+        num_trajectories = input_data.shape[0]
+        decoded_output = torch.empty(num_trajectories, self.input_sequence_length, 1)
+        forward_output = torch.empty(num_trajectories, self.future_sequence_length, 1)
+
+        for start in range(0, num_trajectories, max_batch_size):
+            end = start + max_batch_size
+            decoded_output[start:end], forward_output[start:end] = self.engine.run(input_data[start:end])
+
+        decoded_output *= self.x_limit
+        forward_output *= self.x_limit
+
+        return decoded_output, forward_output
+
+
+class StreamingPredictor:
+    """
+    Predicts the future trajectory of one obstacle from observations fed one at a time.
+
+    In the sliding window mode, which has the semantics of Predictor.predict on the latest input sequence, one partial
+    encoding is started at every observation and all of them are advanced together by a single batched LSTM step, so
+    the encoding of the latest full window is always ready without re-running the history. Otherwise a single encoder
+    state accumulates the whole history, which costs one LSTM step per observation.
+    """
+
+    def __init__(self, predictor, sliding_window=True):
+        """
+        The initialization of the class.
+
+        :param predictor: the Predictor whose model is used
+        :param sliding_window: True to encode only the latest input sequence, False to encode the whole history
+        """
+        self.predictor = predictor
+        self.model = predictor.model
+        self.sliding_window = sliding_window
+        self.window = predictor.input_sequence_length
+        self.num_observations = 0
+        self.hidden_states = None
+        self.cell_states = None
+        self.window_state = None
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets all observations.
+
+        :return: None
+        """
+        encoder = self.model.encoder_
+        self.num_observations = 0
+        self.hidden_states = torch.zeros(encoder.num_layers_, 0, encoder.hidden_size_)
+        self.cell_states = torch.zeros(encoder.num_layers_, 0, encoder.hidden_size_)
+        self.window_state = None
+
+    def is_ready(self):
+        """
+        Checks if enough positions have been observed to fill an input sequence.
+
+        :return: True if a forecast can be made, False otherwise
+        """
+        return self.num_observations >= self.window
+
+    @inference_mode()
+    def observe(self, x):
+        """
+        Feeds the next observed position of the obstacle.
+
+        :param x: the observed position
+        :return: None
+        """
+        encoder = self.model.encoder_
+        self.num_observations += 1
+
+        if self.sliding_window or self.num_observations == 1:
+            new_state = torch.zeros(encoder.num_layers_, 1, encoder.hidden_size_)
+            self.hidden_states = torch.cat((self.hidden_states, new_state), dim=1)
+            self.cell_states = torch.cat((self.cell_states, new_state), dim=1)
+
+        num_states = self.hidden_states.shape[1]
+        input_data = torch.full((num_states, 1, encoder.input_size_), x / self.predictor.x_limit)
+        _, (self.hidden_states, self.cell_states) = encoder.encoder_(input_data,
+                                                                     (self.hidden_states, self.cell_states))
+
+        if not self.sliding_window:
+            self.window_state = (self.hidden_states, self.cell_states)
+        elif self.num_observations >= self.window:
+            # The oldest partial encoding has just seen a full window.
+            self.window_state = (self.hidden_states[:, :1], self.cell_states[:, :1])
+            self.hidden_states = self.hidden_states[:, 1:]
+            self.cell_states = self.cell_states[:, 1:]
+
+    @inference_mode()
+    def forecast(self):
+        """
+        Predicts the future trajectory from the current encoder state.
+
+        :return: the (1, future sequence length, 1) future trajectory
+        """
+        if not self.is_ready():
+            raise RuntimeError("Only %d of %d positions have been observed." % (self.num_observations, self.window))
+
+        hidden_state, cell_state = self.window_state
+        encoded_output = hidden_state[-1].unsqueeze(1)
+        forward_output = self.model.predict_future_from_state(encoded_output, (hidden_state, cell_state))
+
+        return forward_output * self.predictor.x_limit
+
 
 if __name__ == '__main__':
     task_test = tasks[105]
@@ -0,0 +1,100 @@
+from collections import deque
+
+
+class RouteGraph:
+    """
+    The directed route graph of the planners with a shortest-path tree rooted at the origin.
+
+    The depth and the parent of every node are updated in place whenever a node or an edge is added, so the depth of a
+    node, which is the number of moves needed to reach it from the origin, is a dictionary lookup instead of a BFS.
+    """
+
+    def __init__(self, origin):
+        """
+        The initialization of the class.
+
+        :param origin: the root node of the graph
+        """
+        self.origin = origin
+        self.route_dict = {origin: set()}
+        self.depth = {origin: 0}
+        self.parents = {origin: None}
+
+        # The number of the times the depth of a node was set or shortened.
+        self.num_relaxations = 0
+
+    def __contains__(self, node):
+        return node in self.route_dict
+
+    def __len__(self):
+        return len(self.route_dict)
+
+    def add_node(self, node):
+        """
+        Adds a node without any edge.
+
+        :param node: the node to be added
+        :return: None
+        """
+        if node not in self.route_dict:
+            self.route_dict[node] = set()
+
+    def add_edge(self, start_node, end_node):
+        """
+        Adds a directed edge and shortens the depths of the nodes that can now be reached in fewer moves.
+
+        :param start_node: the node where the edge starts
+        :param end_node: the node where the edge ends
+        :return: None
+        """
+        self.route_dict[start_node].add(end_node)
+
+        if start_node not in self.depth:
+            return
+
+        new_depth = self.depth[start_node] + 1
+
+        if new_depth >= self.depth.get(end_node, new_depth + 1):
+            return
+
+        self.depth[end_node] = new_depth
+        self.parents[end_node] = start_node
+        self.num_relaxations += 1
+        queue = deque([end_node])
+
+        # All edges have the same length, so the relaxation reaches every node in the order of its new depth.
+        while queue:
+            parent = queue.popleft()
+            child_depth = self.depth[parent] + 1
+
+            for child in self.route_dict[parent]:
+                if child_depth < self.depth.get(child, child_depth + 1):
+                    self.depth[child] = child_depth
+                    self.parents[child] = parent
+                    self.num_relaxations += 1
+                    queue.append(child)
+
+    def get_depth(self, node):
+        """
+        Gets the number of moves on the shortest path from the origin to the given node.
+
+        :param node: a node reachable from the origin
+        :return: the depth of the node
+        """
+        return self.depth[node]
+
+    def get_path(self, end_node):
+        """
+        Gets a shortest path from the origin to the given node along the parents.
+
+        :param end_node: a node reachable from the origin
+        :return: the list of the nodes on the path
+        """
+        path = [end_node]
+
+        while path[-1] != self.origin:
+            path.append(self.parents[path[-1]])
+
+        path.reverse()
+
+        return path
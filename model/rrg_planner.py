@@ -0,0 +1,379 @@
+import time
+from collections import deque
+from math import inf
+
+from model.maze import MazePlanner, Node, make_occupancy_grid
+from model.plan_result import PlanResult
+from model.planner import check_path, is_over_budget, path_to_policy
+from model.route_graph import RouteGraph
+from model.samplers import choose_direction, make_sampler
+from model.spatial_index import make_spatial_index
+
+
+class RRGPlanner(MazePlanner):
+    """
+    The planner of planner.py kept alive across replans, which loads the predictor once and keeps its roadmap.
+
+    The roadmap holds every node ever sampled with the edges that are valid against the walls and the map bounds. An
+    edge that never enters the range of the obstacle is valid whenever it is taken. The validity of the other edges
+    depends on the time step when they are taken, so each plan checks them again against the new prediction, visiting
+    the roadmap in the order of the depth from the origin so that every edge is checked at its final time step. The
+    sampling then only goes on when the roadmap does not already lead safely to the target.
+    """
+
+    def __init__(self, task=None, checkpoint_path=None, predictor=None, load_predictor=True, index_type='grid',
+                 batch_size=1, stall_iterations=1000, sampler='uniform', rng=None):
+        """
+        The initialization of the class.
+
+        :param task: the task of the predictor, as in get_predictor
+        :param checkpoint_path: the checkpoint of the predictor, as in get_predictor
+        :param predictor: a loaded Predictor, as in get_predictor
+        :param load_predictor: whether to load the predictor, as in get_predictor
+        :param index_type: the type of the spatial index of the nodes, 'grid' or 'kdtree'
+        :param batch_size: the number of the samples checked together
+        :param stall_iterations: the number of the sampling iterations without a new node after which a plan without
+                                 a budget gives up
+        :param sampler: the sampler of the moves, or its type for make_sampler
+        :param rng: the random.Random of the sampler made from its type, or None for the random module
+        """
+        super().__init__(task=task, checkpoint_path=checkpoint_path, predictor=predictor, load_predictor=load_predictor)
+        self.index_type = index_type
+        self.batch_size = batch_size
+        self.stall_iterations = stall_iterations
+        self.sampler = make_sampler(sampler, rng=rng)
+
+        # Without a prediction, the time steps before the horizon only hold the walls, and the horizon holds the whole
+        # range of the obstacle, which tells the static edges from the time-dependent ones.
+        self.static_grid = make_occupancy_grid()
+        self.occupancy_grid = make_occupancy_grid()
+
+        self.roadmap = None
+        self.target_nodes = None
+        self.spatial_index = None
+        self.reset_roadmap()
+
+    def reset_roadmap(self):
+        """
+        Forgets all the sampled nodes but the origin.
+
+        :return: None
+        """
+        # Every node maps to the nodes it leads to, each with the direction of the move and whether its validity
+        # depends on the time step.
+        self.roadmap = {self.origin: {}}
+        self.target_nodes = []
+        self.spatial_index = make_spatial_index(self.index_type, cell_size=self.agent_step,
+                                                origin_x=self.origin.x - self.agent_step / 2,
+                                                origin_y=self.origin.y - self.agent_step / 2)
+        self.spatial_index.insert(self.origin)
+        self.sampler.reset(origin=self.origin, map_size=self.map_size, agent_step=self.agent_step, target=self.target)
+
+    @property
+    def num_nodes(self):
+        return len(self.roadmap)
+
+    def plan_prediction(self, prediction, time_budget=None, max_iterations=None, should_stop=None):
+        """
+        Plans a route around the given predicted positions of the obstacle, reusing and extending the roadmap.
+
+        The reachable nodes in the target are tried first, in the order of their depth. When none of them leads there
+        safely, the sampling goes on like planner until a node in the target is reached anew or in fewer moves. Without
+        a budget, the policy of the result is None if that path is not collision-free, or if the roadmap stops growing
+        for stall_iterations before that. With a time or iteration budget, the sampling stops when the budget runs
+        out, and the result falls back to the collision-free path to the node closest to the target.
+
+        :param prediction: the predicted positions x of the obstacle at each time step
+        :param time_budget: the wall-clock seconds of the call, or None
+        :param max_iterations: the largest number of the sampling iterations, or None
+        :param should_stop: a function returning True when the plan is no longer needed, checked before each sampling
+            iteration to stop the sampling as if the budget had run out, or None
+        :return: a PlanResult
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + time_budget if time_budget is not None else None
+        anytime = time_budget is not None or max_iterations is not None
+        self.occupancy_grid.set_prediction(prediction)
+        self.sampler.reset_counts()
+
+        found = False
+        checked_depth = {}
+        blocked = set()
+        num_relaxations = 0
+
+        # The roadmap has one shortest path to each node, so the first unsafe milestone of the path to the closest
+        # node in the target is left out and the route graph is built again, until a path is safe or none is left.
+        while True:
+            route_graph = self._validate_roadmap(blocked)
+            path = [self.origin]
+            danger_obstacles = []
+            target_nodes = [node for node in self.target_nodes if node in route_graph]
+
+            if not target_nodes:
+                break
+
+            conflicts = []
+
+            for node in sorted(target_nodes, key=route_graph.get_depth):
+                checked_depth[node] = route_graph.get_depth(node)
+                path = route_graph.get_path(node)
+                found, danger_obstacles, conflict = self._check_path(path, prediction, route_graph)
+
+                if found:
+                    break
+
+                conflicts.append(conflict)
+
+            if found:
+                break
+
+            blocked.add(conflicts[0])
+            num_relaxations += route_graph.num_relaxations
+
+        validation_time = time.perf_counter()
+        num_iterations = 0
+
+        if not found:
+            last_node, num_iterations = self._sample(route_graph, blocked, checked_depth, deadline, max_iterations,
+                                                     anytime, should_stop)
+
+            if last_node is not None:
+                path = route_graph.get_path(last_node)
+                found, danger_obstacles, _ = self._check_path(path, prediction, route_graph)
+
+        num_relaxations += route_graph.num_relaxations
+        search_time = time.perf_counter()
+        policy = None
+
+        if not found and anytime:
+            path, danger_obstacles = self._find_best_partial_path(prediction, route_graph)
+
+        if found or anytime:
+            policy = path_to_policy(path)
+
+        end_time = time.perf_counter()
+
+        return PlanResult(
+            origin=self.origin,
+            route_dict=route_graph.route_dict,
+            path=path,
+            policy=policy,
+            found=found,
+            prediction=prediction,
+            milestone_steps=[route_graph.get_depth(milestone) * self.step_size for milestone in path],
+            danger_obstacles=danger_obstacles,
+            walls=self.walls,
+            target=self.target,
+            obstacle_range=self.obstacle_range,
+            map_size=self.map_size,
+            timings={
+                'prediction': 0.0,
+                'validation': validation_time - start_time,
+                'search': search_time - validation_time,
+                'path': end_time - search_time,
+                'total': end_time - start_time
+            },
+            num_iterations=num_iterations,
+            num_relaxations=num_relaxations,
+            sample_counts=self.sampler.get_counts()
+        )
+
+    def _validate_roadmap(self, blocked):
+        """
+        Builds the route graph of the current prediction from the roadmap, one depth at a time, checking the
+        time-dependent edges of each depth in one batch at the time step when the agent takes them.
+
+        :param blocked: the set of the nodes left out
+        :return: the RouteGraph of the nodes reachable from the origin
+        """
+        route_graph = RouteGraph(self.origin)
+        level = [self.origin]
+        depth = 0
+
+        while level:
+            static_edges = []
+            dependent_edges = []
+
+            for node in level:
+                for child, (dir_x, dir_y, time_dependent) in self.roadmap[node].items():
+                    if child in blocked:
+                        continue
+
+                    if time_dependent:
+                        dependent_edges.append((node, child, dir_x, dir_y))
+                    else:
+                        static_edges.append((node, child))
+
+            if dependent_edges:
+                valid = self.occupancy_grid.valid_moves(
+                    start_x=[node.x for node, _, _, _ in dependent_edges],
+                    start_y=[node.y for node, _, _, _ in dependent_edges],
+                    dir_x=[dir_x for _, _, dir_x, _ in dependent_edges],
+                    dir_y=[dir_y for _, _, _, dir_y in dependent_edges],
+                    start_step=[depth * self.step_size] * len(dependent_edges),
+                    step_size=self.step_size
+                )
+                static_edges += [(node, child) for (node, child, _, _), v in zip(dependent_edges, valid) if v]
+
+            level = []
+
+            for node, child in static_edges:
+                if child not in route_graph:
+                    route_graph.add_node(child)
+                    level.append(child)
+
+                route_graph.add_edge(node, child)
+
+            depth += 1
+
+        return route_graph
+
+    def _classify_moves(self, moves):
+        """
+        Checks a batch of moves against the walls and the map bounds, and whether they enter the range of the obstacle.
+
+        :param moves: a list of (start node, direction x, direction y)
+        :return: a list of (whether the move is valid, whether its validity depends on the time step)
+        """
+        if not moves:
+            return []
+
+        kwargs = dict(
+            start_x=[start_node.x for start_node, _, _ in moves],
+            start_y=[start_node.y for start_node, _, _ in moves],
+            dir_x=[dir_x for _, dir_x, _ in moves],
+            dir_y=[dir_y for _, _, dir_y in moves],
+            step_size=self.step_size
+        )
+        valid = self.static_grid.valid_moves(start_step=[0] * len(moves), **kwargs)
+        always_valid = self.static_grid.valid_moves(start_step=[self.static_grid.horizon] * len(moves), **kwargs)
+
+        return [(bool(v), not a) for v, a in zip(valid, always_valid)]
+
+    def _is_valid_edge(self, route_graph, start_node, end_node):
+        dir_x, dir_y, time_dependent = self.roadmap[start_node][end_node]
+
+        return not time_dependent or self.occupancy_grid.is_valid_move(
+            start_node.x, start_node.y, dir_x, dir_y, start_step=route_graph.get_depth(start_node) * self.step_size,
+            step_size=self.step_size)
+
+    def _add_roadmap_edge(self, route_graph, blocked, start_node, end_node, dir_x, dir_y, time_dependent):
+        """
+        Adds a statically valid edge to the roadmap, and to the route graph if its start node is reachable and the
+        move is valid at the time step when the agent gets there. A node reached for the first time brings along the
+        part of the roadmap behind it.
+        """
+        self.roadmap[start_node][end_node] = (dir_x, dir_y, time_dependent)
+
+        if end_node in blocked or start_node not in route_graph \
+                or not self._is_valid_edge(route_graph, start_node, end_node):
+            return
+
+        if end_node in route_graph:
+            route_graph.add_edge(start_node, end_node)
+            return
+
+        route_graph.add_node(end_node)
+        route_graph.add_edge(start_node, end_node)
+        queue = deque([end_node])
+
+        while queue:
+            node = queue.popleft()
+
+            for child in self.roadmap[node]:
+                if child not in blocked and self._is_valid_edge(route_graph, node, child):
+                    if child not in route_graph:
+                        route_graph.add_node(child)
+                        queue.append(child)
+
+                    route_graph.add_edge(node, child)
+
+    def _sample(self, route_graph, blocked, checked_depth, deadline, max_iterations, anytime, should_stop=None):
+        """
+        Grows the roadmap and the route graph by sampling like planner until a node in the target is reachable in
+        fewer moves than when it was last checked.
+
+        :param route_graph: the RouteGraph of the current prediction
+        :param blocked: the set of the nodes left out of the route graph
+        :param checked_depth: the dictionary of the depths at which the nodes in the target have been checked
+        :return: the node in the target, or None, and the number of the sampling iterations
+        """
+        agent_step = self.agent_step
+        num_iterations = 0
+        last_growth = 0
+
+        while True:
+            if anytime and is_over_budget(deadline, num_iterations, max_iterations):
+                return None, num_iterations
+
+            if should_stop is not None and should_stop():
+                return None, num_iterations
+
+            if not anytime and num_iterations - last_growth >= self.stall_iterations:
+                return None, num_iterations
+
+            num_iterations += 1
+            candidates = []
+
+            for _ in range(self.batch_size):
+                candidate = self.sampler.sample(self.spatial_index)
+
+                if candidate is not None:
+                    candidates.append(candidate)
+
+            for (n_nearest, direction_x, direction_y), (valid, time_dependent) in zip(
+                    candidates, self._classify_moves(candidates)):
+                if not valid:
+                    continue
+
+                new_node = Node(n_nearest.x + direction_x * agent_step, n_nearest.y + direction_y * agent_step)
+
+                if new_node in self.roadmap:
+                    continue
+
+                last_growth = num_iterations
+                self.roadmap[new_node] = {}
+                self.spatial_index.insert(new_node)
+                self.sampler.add_node(new_node)
+
+                if self.target.interfere_node(new_node.x, new_node.y):
+                    self.target_nodes.append(new_node)
+
+                # The move from the nearest node, the move back to it, then the moves from the diagonal neighbours.
+                moves = [(new_node, -direction_x, -direction_y)]
+
+                for p in self.spatial_index.within(new_node.x, new_node.y, agent_step):
+                    if abs(p.x - new_node.x) == agent_step and abs(p.y - new_node.y) == agent_step:
+                        moves.append((p, *choose_direction(p.x, p.y, new_node.x, new_node.y)))
+
+                self._add_roadmap_edge(route_graph, blocked, n_nearest, new_node, direction_x, direction_y,
+                                       time_dependent)
+
+                for (start_node, dir_x, dir_y), (move_valid, move_time_dependent) in zip(
+                        moves, self._classify_moves(moves)):
+                    if move_valid:
+                        end_node = n_nearest if start_node == new_node else new_node
+                        self._add_roadmap_edge(route_graph, blocked, start_node, end_node, dir_x, dir_y,
+                                               move_time_dependent)
+
+                for node in self.target_nodes:
+                    if node in route_graph and route_graph.get_depth(node) < checked_depth.get(node, inf):
+                        return node, num_iterations
+
+    def _check_path(self, path, prediction, route_graph):
+        # The roadmap keeps deep nodes in the range of the obstacle across replans, which check_path rejects when they
+        # are reached past the horizon of the prediction.
+        return check_path(path, [route_graph.get_depth(milestone) * self.step_size for milestone in path], prediction,
+                          self.obstacle_range, self.obstacle_width, self.obstacle_thickness)
+
+    def _find_best_partial_path(self, prediction, route_graph):
+        # The nodes closest to the target first, and the shallowest of the equally close ones.
+        nodes = sorted(route_graph.route_dict,
+                       key=lambda node: (self.target.distance_to_node(node.x, node.y), route_graph.get_depth(node)))
+
+        for node in nodes:
+            path = route_graph.get_path(node)
+            safe, danger_obstacles, _ = self._check_path(path, prediction, route_graph)
+
+            if safe:
+                return path, danger_obstacles
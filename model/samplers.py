@@ -0,0 +1,314 @@
+import random
+
+LATTICE_DIRECTIONS = [(dir_x, dir_y) for dir_x in (-1, 0, 1) for dir_y in (-1, 0, 1) if dir_x or dir_y]
+
+
+def choose_direction(start_x, start_y, end_x, end_y):
+    if start_x < end_x and abs(start_x - end_x) > 1:
+        dir_x = 1
+    elif start_x > end_x and abs(start_x - end_x) > 1:
+        dir_x = -1
+    else:
+        dir_x = 0
+
+    if start_y < end_y and abs(start_y - end_y) > 1:
+        dir_y = 1
+    elif start_y > end_y and abs(start_y - end_y) > 1:
+        dir_y = -1
+    else:
+        dir_y = 0
+
+    return dir_x, dir_y
+
+
+class UniformSampler:
+    """
+    The sampling of the planners: a point is drawn uniformly over the map, and the node nearest to it in terms of
+    node_distance moves toward it if it is within one step of the agent. Most of the points are too far from the graph
+    and are thrown away.
+
+    The planners call reset with the map before sampling and add_node for every node they add, and the samplers count
+    the points drawn, the moves proposed and the nodes added from them.
+    """
+
+    def __init__(self, rng=None):
+        """
+        The initialization of the class.
+
+        :param rng: the random.Random of the samples, or None for the random module
+        """
+        self.rng = rng if rng is not None else random
+        self.map_size = None
+        self.agent_step = None
+        self.target = None
+        self.num_samples = 0
+        self.num_candidates = 0
+        self.num_accepted = 0
+
+    def reset(self, origin, map_size, agent_step, target):
+        """
+        Starts a new graph.
+
+        :param origin: the root node of the graph
+        :param map_size: the half side length of the map
+        :param agent_step: the length of a move along each axis
+        :param target: the area of the target
+        :return: None
+        """
+        self.map_size = map_size
+        self.agent_step = agent_step
+        self.target = target
+        self.reset_counts()
+
+    def reset_counts(self):
+        """
+        Sets the counters to zero.
+
+        :return: None
+        """
+        self.num_samples = 0
+        self.num_candidates = 0
+        self.num_accepted = 0
+
+    def add_node(self, node):
+        """
+        Records a node added to the graph from a move proposed by sample.
+
+        :param node: the new node
+        :return: None
+        """
+        self.num_accepted += 1
+
+    def sample(self, spatial_index):
+        """
+        Proposes a move of a node of the graph.
+
+        :param spatial_index: the spatial index of the nodes of the graph
+        :return: (start node, direction x, direction y), or None if the sample is thrown away
+        """
+        self.num_samples += 1
+        candidate = self._sample(spatial_index)
+
+        if candidate is not None:
+            self.num_candidates += 1
+
+        return candidate
+
+    def _sample(self, spatial_index):
+        return self._sample_point(spatial_index, self.rng.uniform(-self.map_size, self.map_size),
+                                  self.rng.uniform(-self.map_size, self.map_size))
+
+    def _sample_point(self, spatial_index, pos_rand_x, pos_rand_y, max_distance=None):
+        if max_distance is None:
+            max_distance = self.agent_step
+
+        n_nearest, _ = spatial_index.nearest(pos_rand_x, pos_rand_y, max_distance=max_distance)
+
+        if n_nearest is None:
+            return None
+
+        direction_x, direction_y = choose_direction(n_nearest.x, n_nearest.y, pos_rand_x, pos_rand_y)
+
+        return n_nearest, direction_x, direction_y
+
+    @property
+    def candidate_rate(self):
+        return self.num_candidates / self.num_samples if self.num_samples else 0.0
+
+    @property
+    def acceptance_rate(self):
+        return self.num_accepted / self.num_samples if self.num_samples else 0.0
+
+    def get_counts(self):
+        """
+        Gets the counters of the samples.
+
+        :return: a dictionary of the numbers of the samples, the proposed moves and the added nodes, and their rates
+        """
+        return {
+            'samples': self.num_samples,
+            'candidates': self.num_candidates,
+            'accepted': self.num_accepted,
+            'candidate_rate': self.candidate_rate,
+            'acceptance_rate': self.acceptance_rate
+        }
+
+
+class GoalBiasedSampler(UniformSampler):
+    """
+    Draws the point in the target instead of over the whole map with the probability goal_bias, and lets the node
+    nearest to it move toward it however far it is, which pulls the graph toward the target.
+    """
+
+    def __init__(self, goal_bias=0.2, rng=None):
+        """
+        The initialization of the class.
+
+        :param goal_bias: the probability of drawing the point in the target
+        :param rng: the random.Random of the samples, or None for the random module
+        """
+        super().__init__(rng)
+        self.goal_bias = goal_bias
+
+    def _sample(self, spatial_index):
+        if self.rng.random() < self.goal_bias:
+            return self._sample_point(spatial_index, self.rng.uniform(self.target.min_x, self.target.max_x),
+                                      self.rng.uniform(self.target.min_y, self.target.max_y),
+                                      max_distance=float('inf'))
+
+        return super()._sample(spatial_index)
+
+
+class FrontierSampler(UniformSampler):
+    """
+    Draws the point around a free neighbour on the route lattice of a random node of the frontier, which is the nodes
+    with a free neighbour inside the map, so the point is close enough to the graph to be kept and usually leads out
+    of it.
+    """
+
+    def __init__(self, rng=None):
+        """
+        The initialization of the class.
+
+        :param rng: the random.Random of the samples, or None for the random module
+        """
+        super().__init__(rng)
+        self.nodes = set()
+        self.frontier = []
+
+    def reset(self, origin, map_size, agent_step, target):
+        super().reset(origin, map_size, agent_step, target)
+        self.nodes = {origin}
+        self.frontier = [origin]
+
+    def add_node(self, node):
+        super().add_node(node)
+        self.nodes.add(node)
+        self.frontier.append(node)
+
+    def _free_directions(self, node):
+        free = []
+
+        for dir_x, dir_y in LATTICE_DIRECTIONS:
+            x = node.x + dir_x * self.agent_step
+            y = node.y + dir_y * self.agent_step
+
+            if abs(x) <= self.map_size and abs(y) <= self.map_size and type(node)(x, y) not in self.nodes:
+                free.append((dir_x, dir_y))
+
+        return free
+
+    def _pick_frontier_node(self):
+        # The nodes found to have no free neighbour are dropped from the frontier when they are drawn.
+        while self.frontier:
+            index = self.rng.randrange(len(self.frontier))
+            node = self.frontier[index]
+            free = self._free_directions(node)
+
+            if free:
+                return node, free
+
+            self.frontier[index] = self.frontier[-1]
+            self.frontier.pop()
+
+        return None, None
+
+    def _sample(self, spatial_index):
+        node, free = self._pick_frontier_node()
+
+        if node is None:
+            return super()._sample(spatial_index)
+
+        dir_x, dir_y = free[self.rng.randrange(len(free))]
+        half_step = self.agent_step / 2
+
+        return self._sample_point(spatial_index,
+                                  node.x + dir_x * self.agent_step + self.rng.uniform(-half_step, half_step),
+                                  node.y + dir_y * self.agent_step + self.rng.uniform(-half_step, half_step))
+
+
+class LatticeSampler(FrontierSampler):
+    """
+    Skips the point and proposes directly the move of a frontier node to one of its free neighbours on the route
+    lattice. With the probability goal_bias, the move is the one of the frontier leading closest to the target,
+    otherwise it is drawn at random. Each move is proposed once, since a move the planner rejected would mostly be
+    rejected again.
+    """
+
+    def __init__(self, goal_bias=0.5, rng=None):
+        """
+        The initialization of the class.
+
+        :param goal_bias: the probability of proposing the move leading closest to the target
+        :param rng: the random.Random of the samples, or None for the random module
+        """
+        super().__init__(rng)
+        self.goal_bias = goal_bias
+        self.proposed = set()
+
+    def reset(self, origin, map_size, agent_step, target):
+        super().reset(origin, map_size, agent_step, target)
+        self.proposed = set()
+
+    def _free_directions(self, node):
+        return [direction for direction in super()._free_directions(node) if (node, direction) not in self.proposed]
+
+    def _closest_move(self):
+        best_key = None
+        best_move = None
+
+        for node in self.frontier:
+            for dir_x, dir_y in self._free_directions(node):
+                key = self.target.distance_to_node(node.x + dir_x * self.agent_step, node.y + dir_y * self.agent_step)
+
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_move = node, (dir_x, dir_y)
+
+        return best_move
+
+    def _sample(self, spatial_index):
+        move = self._closest_move() if self.rng.random() < self.goal_bias else None
+
+        if move is None:
+            node, free = self._pick_frontier_node()
+
+            if node is None:
+                return UniformSampler._sample(self, spatial_index)
+
+            move = node, free[self.rng.randrange(len(free))]
+
+        node, direction = move
+        self.proposed.add(move)
+
+        return node, direction[0], direction[1]
+
+
+def make_sampler(sampler, rng=None):
+    """
+    Makes a sampler of the given type.
+
+    :param sampler: 'uniform', 'goal', 'frontier', 'lattice' or 'random_lattice', or a sampler, which is returned as
+                    it is
+    :param rng: the random.Random of the samples, or None for the random module
+    :return: the sampler
+    """
+    if not isinstance(sampler, str):
+        return sampler
+
+    if sampler == 'uniform':
+        return UniformSampler(rng=rng)
+
+    if sampler == 'goal':
+        return GoalBiasedSampler(rng=rng)
+
+    if sampler == 'frontier':
+        return FrontierSampler(rng=rng)
+
+    if sampler == 'lattice':
+        return LatticeSampler(rng=rng)
+
+    if sampler == 'random_lattice':
+        return LatticeSampler(goal_bias=0.0, rng=rng)
+
+    raise ValueError("Unknown sampler type: %s." % sampler)
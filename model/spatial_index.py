@@ -0,0 +1,290 @@
+from math import sqrt, floor, inf
+
+
+def node_distance(x_0, y_0, x_1, y_1):
+    """
+    The distance used by the planners to find the nearest node of a sampled point.
+
+    :return: the square root of the Manhattan distance between the two points
+    """
+    return sqrt(abs(x_0 - x_1) + abs(y_0 - y_1))
+
+
+class GridIndex:
+    """
+    A bucket hash over square cells for the nearest-node lookup of the planners.
+
+    With the cell size equal to the step of the route lattice, each cell holds at most one node, so a query only
+    visits a constant number of buckets around the queried point.
+    """
+
+    def __init__(self, cell_size, origin_x=0.0, origin_y=0.0):
+        """
+        The initialization of the class.
+
+        :param cell_size: the side length of a cell
+        :param origin_x: the position x of a cell corner
+        :param origin_y: the position y of a cell corner
+        """
+        self.cell_size = cell_size
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.buckets = {}
+        self.order = {}
+        self.min_cell = None
+        self.max_cell = None
+
+    def __len__(self):
+        return len(self.order)
+
+    def _cell(self, x, y):
+        return floor((x - self.origin_x) / self.cell_size), floor((y - self.origin_y) / self.cell_size)
+
+    def insert(self, node):
+        """
+        Adds a node to the index.
+
+        :param node: a node with the attributes x and y
+        :return: None
+        """
+        if node in self.order:
+            return
+
+        self.order[node] = len(self.order)
+        cell = self._cell(node.x, node.y)
+        self.buckets.setdefault(cell, []).append(node)
+
+        if self.min_cell is None:
+            self.min_cell = cell
+            self.max_cell = cell
+        else:
+            self.min_cell = (min(self.min_cell[0], cell[0]), min(self.min_cell[1], cell[1]))
+            self.max_cell = (max(self.max_cell[0], cell[0]), max(self.max_cell[1], cell[1]))
+
+    def _ring(self, cell_x, cell_y, radius):
+        if radius == 0:
+            yield cell_x, cell_y
+            return
+
+        for i in range(cell_x - radius, cell_x + radius + 1):
+            yield i, cell_y - radius
+            yield i, cell_y + radius
+
+        for j in range(cell_y - radius + 1, cell_y + radius):
+            yield cell_x - radius, j
+            yield cell_x + radius, j
+
+    def nearest(self, x, y, max_distance=inf):
+        """
+        Finds the nearest node of the given point in terms of node_distance.
+
+        Ties are broken in favor of the node inserted first, which is the same result as a linear scan over the nodes
+        in the insertion order.
+
+        :param x: the position x of the point
+        :param y: the position y of the point
+        :param max_distance: the largest distance accepted
+        :return: the nearest node and its distance, or (None, inf) if no node is within max_distance
+        """
+        if not self.order:
+            return None, inf
+
+        cell_x, cell_y = self._cell(x, y)
+        max_radius = max(abs(cell_x - self.min_cell[0]), abs(cell_x - self.max_cell[0]),
+                         abs(cell_y - self.min_cell[1]), abs(cell_y - self.max_cell[1]))
+        max_manhattan = max_distance * max_distance
+        best_key = (inf, 0)
+        best_node = None
+        best_manhattan = inf
+        radius = 0
+
+        while radius <= max_radius:
+            for cell in self._ring(cell_x, cell_y, radius):
+                for node in self.buckets.get(cell, ()):
+                    key = (node_distance(node.x, node.y, x, y), self.order[node])
+
+                    if key < best_key:
+                        best_key = key
+                        best_node = node
+                        best_manhattan = abs(node.x - x) + abs(node.y - y)
+
+            # Every node beyond this ring is more than radius cells away along one of the axes.
+            reach = radius * self.cell_size
+
+            if best_manhattan <= reach or max_manhattan < reach:
+                break
+
+            radius += 1
+
+        if best_key[0] > max_distance:
+            return None, inf
+
+        return best_node, best_key[0]
+
+    def within(self, x, y, radius):
+        """
+        Finds all nodes whose positions differ from the given point by at most radius along both axes.
+
+        :param x: the position x of the point
+        :param y: the position y of the point
+        :param radius: the largest difference along each axis
+        :return: a list of the nodes in the insertion order
+        """
+        min_cell_x, min_cell_y = self._cell(x - radius, y - radius)
+        max_cell_x, max_cell_y = self._cell(x + radius, y + radius)
+        found = []
+
+        for i in range(min_cell_x, max_cell_x + 1):
+            for j in range(min_cell_y, max_cell_y + 1):
+                for node in self.buckets.get((i, j), ()):
+                    if abs(node.x - x) <= radius and abs(node.y - y) <= radius:
+                        found.append(node)
+
+        found.sort(key=self.order.__getitem__)
+
+        return found
+
+
+class KDTreeIndex:
+    """
+    An incremental 2-d tree for the nearest-node lookup of the planners.
+
+    It does not assume any lattice, which makes it the option for nodes at arbitrary positions.
+    """
+
+    def __init__(self):
+        """
+        The initialization of the class.
+        """
+        # Each tree entry is [node, order, axis, left, right].
+        self.root = None
+        self.order = {}
+
+    def __len__(self):
+        return len(self.order)
+
+    def insert(self, node):
+        """
+        Adds a node to the index.
+
+        :param node: a node with the attributes x and y
+        :return: None
+        """
+        if node in self.order:
+            return
+
+        self.order[node] = len(self.order)
+        entry = [node, self.order[node], 0, None, None]
+
+        if self.root is None:
+            self.root = entry
+            return
+
+        parent = self.root
+
+        while True:
+            axis = parent[2]
+            branch = 3 if node[axis] < parent[0][axis] else 4
+
+            if parent[branch] is None:
+                entry[2] = 1 - axis
+                parent[branch] = entry
+                return
+
+            parent = parent[branch]
+
+    def nearest(self, x, y, max_distance=inf):
+        """
+        Finds the nearest node of the given point in terms of node_distance.
+
+        Ties are broken in favor of the node inserted first, which is the same result as a linear scan over the nodes
+        in the insertion order.
+
+        :param x: the position x of the point
+        :param y: the position y of the point
+        :param max_distance: the largest distance accepted
+        :return: the nearest node and its distance, or (None, inf) if no node is within max_distance
+        """
+        point = (x, y)
+        best = [(inf, 0), None, max_distance * max_distance]
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            entry = stack.pop()
+
+            if entry is None:
+                continue
+
+            node, order, axis = entry[0], entry[1], entry[2]
+            key = (node_distance(node.x, node.y, x, y), order)
+
+            if key < best[0]:
+                best[0] = key
+                best[1] = node
+                best[2] = min(best[2], abs(node.x - x) + abs(node.y - y))
+
+            diff = point[axis] - node[axis]
+            near, far = (entry[3], entry[4]) if diff < 0 else (entry[4], entry[3])
+
+            # The Manhattan distance to any node on the far side is at least the distance to the splitting line.
+            if abs(diff) <= best[2]:
+                stack.append(far)
+
+            stack.append(near)
+
+        if best[0][0] > max_distance:
+            return None, inf
+
+        return best[1], best[0][0]
+
+    def within(self, x, y, radius):
+        """
+        Finds all nodes whose positions differ from the given point by at most radius along both axes.
+
+        :param x: the position x of the point
+        :param y: the position y of the point
+        :param radius: the largest difference along each axis
+        :return: a list of the nodes in the insertion order
+        """
+        point = (x, y)
+        found = []
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            entry = stack.pop()
+
+            if entry is None:
+                continue
+
+            node, axis = entry[0], entry[2]
+
+            if abs(node.x - x) <= radius and abs(node.y - y) <= radius:
+                found.append(node)
+
+            if point[axis] - radius < node[axis]:
+                stack.append(entry[3])
+
+            if point[axis] + radius >= node[axis]:
+                stack.append(entry[4])
+
+        found.sort(key=self.order.__getitem__)
+
+        return found
+
+
+def make_spatial_index(index_type, cell_size=None, origin_x=0.0, origin_y=0.0):
+    """
+    Creates an empty spatial index of the given type.
+
+    :param index_type: 'grid' for GridIndex or 'kdtree' for KDTreeIndex
+    :param cell_size: the side length of a cell of GridIndex
+    :param origin_x: the position x of a cell corner of GridIndex
+    :param origin_y: the position y of a cell corner of GridIndex
+    :return: the spatial index
+    """
+    if index_type == 'grid':
+        return GridIndex(cell_size=cell_size, origin_x=origin_x, origin_y=origin_y)
+    elif index_type == 'kdtree':
+        return KDTreeIndex()
+    else:
+        raise ValueError("Unknown spatial index type: %s." % index_type)
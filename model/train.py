@@ -4,11 +4,10 @@ import torch
 from torch import nn
 from torch import optim
 import numpy as np
-from torch.utils.data import DataLoader
 
 import model.utils as utils
 from model.composite_model import CompositeModel
-from data_processor.data_handler import CsvDataset
+from data_processor.data_handler import BatchLoader, load_data_set
 from data_processor.data_recorder import DataRecorder
 from task_management.task_list import tasks
 from plot import plot_loss
@@ -34,23 +33,19 @@ def train_model(task, eval_freq, checkpoint_path):
         batch_first=True
     ).to(device)
 
-    data_file_train = '../data/data_set/' + task.data_set_csv + '_train.csv'
-    data_set_train = CsvDataset(data_file=data_file_train)
-    data_loader_train = DataLoader(
-        dataset=data_set_train,
+    data_set_train = load_data_set(data_file_prefix='../data/data_set/' + task.data_set_csv + '_train')
+    data_loader_train = BatchLoader(
+        data_set=data_set_train,
         batch_size=4096,
         shuffle=True,
-        num_workers=4,
         drop_last=True
     )
 
-    data_file_valid = '../data/data_set/' + task.data_set_csv + '_valid.csv'
-    data_set_valid = CsvDataset(data_file=data_file_valid)
-    data_loader_valid = DataLoader(
-        dataset=data_set_valid,
+    data_set_valid = load_data_set(data_file_prefix='../data/data_set/' + task.data_set_csv + '_valid')
+    data_loader_valid = BatchLoader(
+        data_set=data_set_valid,
         batch_size=len(data_set_valid),
         shuffle=False,
-        num_workers=1,
         drop_last=False
     )
 
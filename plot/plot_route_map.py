@@ -0,0 +1,72 @@
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.patches import Rectangle
+
+
+def add_area(ax, area, facecolor, alpha):
+    ax.add_patch(Rectangle((area.min_x, area.min_y), area.x_width, area.y_width, fill=True, facecolor=facecolor,
+                           alpha=alpha))
+
+
+def plot(plan_result, show_fig=True, save_fig=False, fig_path='route_map.jpg'):
+    """
+    Draws the route graph and the path of a planner result over the maze.
+
+    :param plan_result: the PlanResult returned by planner or planner_baseline
+    :param show_fig: whether to show the figure
+    :param save_fig: whether to save the figure
+    :param fig_path: the path of the saved figure
+    :return: None
+    """
+    map_size = plan_result.map_size
+    route_dict = plan_result.route_dict
+    path = plan_result.path
+
+    fig, ax = plt.subplots()
+    ax.axis([-map_size, map_size, -map_size, map_size])
+    ax.set_title("RRG Route Map for the Maze Problem")
+    ax.set_xlabel('X')
+    ax.set_ylabel('Y')
+
+    # Each edge is drawn once, whichever directions it has.
+    segments = []
+    drawn = set()
+
+    for parent, children in route_dict.items():
+        for child in children:
+            if (child, parent) not in drawn:
+                drawn.add((parent, child))
+                segments.append([(parent.x, parent.y), (child.x, child.y)])
+
+    ax.add_collection(LineCollection(segments, colors='gray'))
+    ax.scatter([node.x for node in route_dict], [node.y for node in route_dict], s=16, color='gray', zorder=2)
+
+    for danger_obstacle in plan_result.danger_obstacles:
+        add_area(ax, danger_obstacle, facecolor="blue", alpha=1)
+
+    for wall in plan_result.walls:
+        add_area(ax, wall, facecolor="green", alpha=1)
+
+    if plan_result.obstacle_range is not None:
+        add_area(ax, plan_result.obstacle_range, facecolor="blue", alpha=0.2)
+
+    if plan_result.target is not None:
+        add_area(ax, plan_result.target, facecolor="purple", alpha=0.5)
+
+    ax.plot([node.x for node in path], [node.y for node in path], color='orange', lw=3)
+    ax.plot([node.x for node in path[1:]], [node.y for node in path[1:]], ' o', color='orange')
+    ax.plot([plan_result.origin.x, ], [plan_result.origin.y, ], 'rs', markersize=10)
+
+    if save_fig:
+        plt.savefig(fig_path)
+
+    if show_fig:
+        plt.show()
+
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+    from model.planner_baseline import planner_baseline
+
+    plot(planner_baseline(), show_fig=True, save_fig=False)
@@ -3,6 +3,8 @@ import pathlib
 import sys
 import ctypes
 
+import numpy as np
+
 
 class SimEnv:
     """
@@ -30,7 +32,16 @@ class SimEnv:
 
         # C++ control engine.
         self.wrapper = ctypes.CDLL(cdll_path)
-        self.instance = self.wrapper.get_instance(ctypes.c_char_p(model_path), ctypes.c_bool(rendering))
+        self._bind_functions()
+        self.instance = self.wrapper.get_instance(model_path, rendering)
+
+        # The state buffer filled by get_state and step_and_observe, with views of the body and the joint positions.
+        self.num_bodies = self.wrapper.get_num_bodies(self.instance)
+        self.num_qpos = self.wrapper.get_num_qpos(self.instance)
+        self.state = np.zeros(2 * self.num_bodies + self.num_qpos)
+        self.state_xpos = self.state[:2 * self.num_bodies].reshape(self.num_bodies, 2)
+        self.state_qpos = self.state[2 * self.num_bodies:]
+        self._state_pointer = self.state.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
 
         # Indices of the object bodies.
         self.obstacle_body_index = self.get_body_index("obstacle")
@@ -60,13 +71,7 @@ class SimEnv:
         :return: the observations of the environment
         """
 
-        obstacle_pos_x_double = ctypes.c_double(obstacle_pos[0])
-        obstacle_pos_y_double = ctypes.c_double(obstacle_pos[1])
-        agent_pos_x_double = ctypes.c_double(agent_pos[0])
-        agent_pos_y_double = ctypes.c_double(agent_pos[1])
-
-        self.wrapper.reset(self.instance, obstacle_pos_x_double, obstacle_pos_y_double,
-                           agent_pos_x_double, agent_pos_y_double)
+        self.wrapper.reset(self.instance, obstacle_pos[0], obstacle_pos[1], agent_pos[0], agent_pos[1])
         self.obstacle_pos = self.get_body_ini_pos(self.obstacle_body_index)
         self.agent_pos = self.get_body_ini_pos(self.agent_body_index)
 
@@ -86,11 +91,44 @@ class SimEnv:
         :param speed: a tuple representing the speed that needs to be executed
         """
 
-        obstacle_speed_double = ctypes.c_double(speed[0])
-        agent_x_speed_double = ctypes.c_double(speed[1])
-        agent_y_speed_double = ctypes.c_double(speed[2])
+        self.wrapper.step(self.instance, speed[0], speed[1], speed[2])
+
+    def step_and_observe(self, speed, buffer=None):
+        """
+        Makes the actuator of the MuJoCo model do the given action and reads the state, with one call into the
+        engine.
+
+        :param speed: a tuple representing the speed that needs to be executed
+        :param buffer: the float64 array to fill, or None for self.state
+        :return: the filled buffer, laid out as in get_state
+        """
+        buffer, pointer = self._get_state_buffer(buffer)
+        self.wrapper.step_and_observe(self.instance, speed[0], speed[1], speed[2], pointer)
+
+        return buffer
+
+    def get_state(self, buffer=None):
+        """
+        Reads the absolute positions x and y of all the bodies in the order of their indices, followed by the
+        reference positions of all the joints, with one call into the engine.
+
+        :param buffer: the float64 array to fill, or None for self.state
+        :return: the filled buffer
+        """
+        buffer, pointer = self._get_state_buffer(buffer)
+        self.wrapper.get_state(self.instance, pointer)
+
+        return buffer
 
-        self.wrapper.step(self.instance, obstacle_speed_double, agent_x_speed_double, agent_y_speed_double)
+    def _get_state_buffer(self, buffer):
+        if buffer is None:
+            return self.state, self._state_pointer
+
+        if buffer.dtype != np.float64 or not buffer.flags.c_contiguous or buffer.size < self.state.size:
+            raise ValueError("The state buffer must be a contiguous float64 array of at least %d elements."
+                             % self.state.size)
+
+        return buffer, buffer.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
 
     def get_body_index(self, body_name):
         """
@@ -117,12 +155,8 @@ class SimEnv:
         :param body_index: the index representing a simulation object
         :return: the initial position of the simulation object
         """
-        pos_x_func = self.wrapper.get_body_ini_pos_x
-        pos_y_func = self.wrapper.get_body_ini_pos_y
-        pos_x_func.restype = ctypes.c_double
-        pos_y_func.restype = ctypes.c_double
-        pos_x = pos_x_func(self.instance, body_index)
-        pos_y = pos_y_func(self.instance, body_index)
+        pos_x = self.wrapper.get_body_ini_pos_x(self.instance, body_index)
+        pos_y = self.wrapper.get_body_ini_pos_y(self.instance, body_index)
 
         return pos_x, pos_y
 
@@ -133,10 +167,7 @@ class SimEnv:
         :param jnt_index: the index representing a joint
         :return: the reference position of the joint
         """
-        func = self.wrapper.get_qpos
-        func.restype = ctypes.c_double
-
-        return func(self.instance, jnt_index)
+        return self.wrapper.get_qpos(self.instance, jnt_index)
 
     def get_xpos(self, body_index):
         """
@@ -145,15 +176,44 @@ class SimEnv:
         :param body_index: the index representing a simulation object
         :return: the initial position of the simulation object
         """
-        xpos_x_func = self.wrapper.get_xpos_x
-        xpos_y_func = self.wrapper.get_xpos_y
-        xpos_x_func.restype = ctypes.c_double
-        xpos_y_func.restype = ctypes.c_double
-        xpos_x = xpos_x_func(self.instance, body_index)
-        xpos_y = xpos_y_func(self.instance, body_index)
+        xpos_x = self.wrapper.get_xpos_x(self.instance, body_index)
+        xpos_y = self.wrapper.get_xpos_y(self.instance, body_index)
 
         return xpos_x, xpos_y
 
+    def _bind_functions(self):
+        """
+        Declares the signatures of the functions of the wrapper once, so the calls need no conversions set up.
+
+        :return: None
+        """
+        pointer = ctypes.c_void_p
+        double = ctypes.c_double
+        double_pointer = ctypes.POINTER(ctypes.c_double)
+        signatures = {
+            'get_instance': ([ctypes.c_char_p, ctypes.c_bool], pointer),
+            'close': ([pointer], None),
+            'reset': ([pointer, double, double, double, double], None),
+            'get_body_index': ([pointer, ctypes.c_char_p], ctypes.c_int),
+            'get_jnt_index': ([pointer, ctypes.c_char_p], ctypes.c_int),
+            'get_body_ini_pos_x': ([pointer, ctypes.c_int], double),
+            'get_body_ini_pos_y': ([pointer, ctypes.c_int], double),
+            'get_qpos': ([pointer, ctypes.c_int], double),
+            'get_xpos_x': ([pointer, ctypes.c_int], double),
+            'get_xpos_y': ([pointer, ctypes.c_int], double),
+            'render': ([pointer], None),
+            'step': ([pointer, double, double, double], None),
+            'get_num_bodies': ([pointer], ctypes.c_int),
+            'get_num_qpos': ([pointer], ctypes.c_int),
+            'get_state': ([pointer, double_pointer], None),
+            'step_and_observe': ([pointer, double, double, double, double_pointer], None)
+        }
+
+        for name, (argtypes, restype) in signatures.items():
+            func = getattr(self.wrapper, name)
+            func.argtypes = argtypes
+            func.restype = restype
+
     @staticmethod
     def _update_wrapper():
         """
@@ -0,0 +1,268 @@
+import numpy as np
+
+from sim_env.maze_model import MazeModel
+
+
+def get_substep_params(model):
+    """
+    Gets the parameters of one Euler substep of each joint, v' = alpha * v + beta * f and q' = q + h * v', where f is
+    the sum of kv * ctrl of the actuators of the joint.
+
+    :param model: the MazeModel
+    :return: the lists of alpha and beta of the joints
+    """
+    jnt_mass = model.get_jnt_mass().tolist()
+    jnt_gain = [0.0] * len(model.jnt_names)
+    alpha = []
+    beta = []
+
+    for jnt_index, kv in zip(model.actuator_jnt, model.actuator_kv):
+        jnt_gain[jnt_index] += kv
+
+    for jnt_index in range(len(model.jnt_names)):
+        damping = model.jnt_damping[jnt_index]
+        denominator = jnt_mass[jnt_index] + model.timestep * damping
+        alpha.append(1 - model.timestep * (jnt_gain[jnt_index] + damping) / denominator)
+        beta.append(model.timestep / denominator)
+
+    return alpha, beta
+
+
+def get_substep_coefficients(alpha, beta, timestep, num_substeps):
+    """
+    Gets, for each joint, the coefficients of v and f giving the velocity and the position change after the given
+    number of substeps, and the position change after one substep less.
+
+    :param alpha: the list of alpha of the joints
+    :param beta: the list of beta of the joints
+    :param timestep: the time of a substep
+    :param num_substeps: the number of the substeps
+    :return: a list of (v_v, v_f, q_v, q_f, lag_q_v, lag_q_f)
+    """
+    coefficients = []
+
+    for jnt_alpha, jnt_beta in zip(alpha, beta):
+        # The responses to a unit initial velocity and to a unit force, which are summed by linearity.
+        v_v, v_f, q_v, q_f = 1.0, 0.0, 0.0, 0.0
+        lag_q_v, lag_q_f = 0.0, 0.0
+
+        for _ in range(num_substeps):
+            lag_q_v, lag_q_f = q_v, q_f
+            v_v, v_f = jnt_alpha * v_v, jnt_alpha * v_f + jnt_beta
+            q_v, q_f = q_v + timestep * v_v, q_f + timestep * v_f
+
+        coefficients.append((v_v, v_f, q_v, q_f, lag_q_v, lag_q_f))
+
+    return coefficients
+
+
+class KinematicSimEnv:
+    """
+    A pure Python stand-in for SimEnv with the same interface, which needs neither MuJoCo nor a display.
+
+    It integrates the slide joints of the model driven by their velocity actuators the way MuJoCo does with the Euler
+    integrator, where the joint damping is implicit: (M + h * d) * a = kv * (ctrl - v) - d * v. Since the dynamics are
+    linear and the control is constant during a step, the substeps of a step are applied in closed form. Contacts are
+    not modelled, so the bodies pass through each other and the walls.
+    """
+
+    def __init__(self, xml_name, recompile_cpp=False, rendering=False, step_duration=0.5):
+        """
+        The initialization of the class.
+
+        :param xml_name: the name of the xml file in mujoco_model
+        :param recompile_cpp: unused, kept for the compatibility with SimEnv
+        :param rendering: unused, kept for the compatibility with SimEnv
+        :param step_duration: the simulated time of each step
+        """
+        self.model = MazeModel(xml_name)
+        self.rendering = rendering
+        self.step_duration = step_duration
+        self.timestep = self.model.timestep
+
+        num_jnts = len(self.model.jnt_names)
+        self.alpha, self.beta = get_substep_params(self.model)
+        self.substep_coefficients = {}
+        self.body_pos = [[float(pos[0]), float(pos[1])] for pos in self.model.body_pos]
+        self.body_jnts = [[] for _ in self.model.body_names]
+
+        for jnt_index, (body_index, axis) in enumerate(zip(self.model.jnt_body, self.model.jnt_axis)):
+            self.body_jnts[body_index].append((jnt_index, float(axis[0]), float(axis[1])))
+
+        self.time = 0.0
+        self.qpos = [0.0] * num_jnts
+        self.qvel = [0.0] * num_jnts
+
+        # MuJoCo computes the body positions before integrating, so they lag one substep behind qpos.
+        self.xpos_qpos = [0.0] * num_jnts
+
+        # The state buffer filled by get_state and step_and_observe, laid out like the one of SimEnv.
+        self.num_bodies = len(self.model.body_names)
+        self.num_qpos = num_jnts
+        self.state = np.zeros(2 * self.num_bodies + self.num_qpos)
+        self.state_xpos = self.state[:2 * self.num_bodies].reshape(self.num_bodies, 2)
+        self.state_qpos = self.state[2 * self.num_bodies:]
+
+        # Indices of the object bodies.
+        self.obstacle_body_index = self.get_body_index("obstacle")
+        self.agent_body_index = self.get_body_index("agent")
+
+        # Indices of the joints.
+        self.obstacle_jnt_index = self.get_jnt_index("slider:obstacle")
+        self.agent_jnt_x_index = self.get_jnt_index("slider:agent-x")
+        self.agent_jnt_y_index = self.get_jnt_index("slider:agent-y")
+
+        # Initial positions from the configuration.
+        self.obstacle_pos = self.get_body_ini_pos(self.obstacle_body_index)
+        self.agent_pos = self.get_body_ini_pos(self.agent_body_index)
+
+    def close(self):
+        """
+        Closes the instance.
+
+        :return: None
+        """
+        pass
+
+    def reset(self, obstacle_pos=(0.0, 0.0), agent_pos=(2.0, -11.0)):
+        """
+        Resets the model to the initial state.
+
+        :return: None
+        """
+        self.body_pos[self.obstacle_body_index] = [obstacle_pos[0], obstacle_pos[1]]
+        self.body_pos[self.agent_body_index] = [agent_pos[0], agent_pos[1]]
+        self.time = 0.0
+        self.qpos = [0.0] * len(self.qpos)
+        self.qvel = [0.0] * len(self.qvel)
+        self.xpos_qpos = [0.0] * len(self.qpos)
+        self.obstacle_pos = self.get_body_ini_pos(self.obstacle_body_index)
+        self.agent_pos = self.get_body_ini_pos(self.agent_body_index)
+
+    def render(self):
+        """
+        Does nothing, since the environment has no window.
+
+        :return: None
+        """
+        pass
+
+    def step(self, speed):
+        """
+        Makes the actuators of the model do the given action.
+
+        :param speed: a tuple representing the speed that needs to be executed
+        """
+        # Counts the substeps the same way as the MuJoCo loop, which accumulates the time in floating point.
+        start_time = self.time
+        num_substeps = 0
+
+        while self.time - start_time < self.step_duration:
+            self.time += self.timestep
+            num_substeps += 1
+
+        if num_substeps == 0:
+            return
+
+        coefficients = self.substep_coefficients.get(num_substeps)
+
+        if coefficients is None:
+            coefficients = get_substep_coefficients(self.alpha, self.beta, self.timestep, num_substeps)
+            self.substep_coefficients[num_substeps] = coefficients
+
+        force = [0.0] * len(self.qpos)
+
+        for jnt_index, kv, ctrl in zip(self.model.actuator_jnt, self.model.actuator_kv, speed):
+            force[jnt_index] += kv * ctrl
+
+        for jnt_index, (v_v, v_f, q_v, q_f, lag_q_v, lag_q_f) in enumerate(coefficients):
+            v = self.qvel[jnt_index]
+            f = force[jnt_index]
+            q = self.qpos[jnt_index]
+            self.qvel[jnt_index] = v_v * v + v_f * f
+            self.qpos[jnt_index] = q + q_v * v + q_f * f
+            self.xpos_qpos[jnt_index] = q + lag_q_v * v + lag_q_f * f
+
+    def step_and_observe(self, speed, buffer=None):
+        """
+        Makes the actuators of the model do the given action and reads the state.
+
+        :param speed: a tuple representing the speed that needs to be executed
+        :param buffer: the float64 array to fill, or None for self.state
+        :return: the filled buffer, laid out as in get_state
+        """
+        self.step(speed)
+
+        return self.get_state(buffer)
+
+    def get_state(self, buffer=None):
+        """
+        Reads the absolute positions x and y of all the bodies in the order of their indices, followed by the
+        reference positions of all the joints.
+
+        :param buffer: the float64 array to fill, or None for self.state
+        :return: the filled buffer
+        """
+        if buffer is None:
+            buffer = self.state
+
+        num_xpos = 2 * self.num_bodies
+        xpos = buffer[:num_xpos].reshape(self.num_bodies, 2)
+
+        for body_index in range(self.num_bodies):
+            xpos[body_index] = self.get_xpos(body_index)
+
+        buffer[num_xpos: num_xpos + self.num_qpos] = self.qpos
+
+        return buffer
+
+    def get_body_index(self, body_name):
+        """
+        Gets the index of a body using its name.
+
+        :param body_name: the name of the body
+        :return: the index of the body
+        """
+        return self.model.get_body_index(body_name)
+
+    def get_jnt_index(self, jnt_name):
+        """
+        Gets the index of a joint using its name.
+
+        :param jnt_name: the name of the joint
+        :return: the index of the joint
+        """
+        return self.model.get_jnt_index(jnt_name)
+
+    def get_body_ini_pos(self, body_index):
+        """
+        Gets the initial position of the simulation object represented by the given index.
+
+        :param body_index: the index representing a simulation object
+        :return: the initial position of the simulation object
+        """
+        return self.body_pos[body_index][0], self.body_pos[body_index][1]
+
+    def get_qpos(self, jnt_index):
+        """
+        Gets the reference position of the joint represented by the given index.
+
+        :param jnt_index: the index representing a joint
+        :return: the reference position of the joint
+        """
+        return self.qpos[jnt_index]
+
+    def get_xpos(self, body_index):
+        """
+        Gets the absolute position of the simulation object represented by the given index.
+
+        :param body_index: the index representing a simulation object
+        :return: the absolute position of the simulation object
+        """
+        xpos_x, xpos_y = self.body_pos[body_index]
+
+        for jnt_index, axis_x, axis_y in self.body_jnts[body_index]:
+            xpos_x += axis_x * self.xpos_qpos[jnt_index]
+            xpos_y += axis_y * self.xpos_qpos[jnt_index]
+
+        return xpos_x, xpos_y
@@ -0,0 +1,218 @@
+import os
+import pathlib
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+
+
+def _floats(text):
+    return [float(value) for value in text.split()]
+
+
+def _read_stl_vertices(stl_path):
+    """
+    Reads the vertices of a binary STL file.
+    """
+    with open(stl_path, 'rb') as f:
+        f.seek(80)
+        num_triangles = int(np.fromfile(f, dtype='<u4', count=1)[0])
+        triangles = np.fromfile(f, dtype=np.dtype([('normal', '<f4', 3), ('vertices', '<f4', (3, 3)),
+                                                    ('attribute', '<u2')]), count=num_triangles)
+
+    return triangles['vertices'].reshape(-1, 3).astype(np.float64)
+
+
+def _quat_to_mat(quat):
+    """
+    Converts a quaternion (w, x, y, z), which does not need to be normalized, into a rotation matrix.
+    """
+    w, x, y, z = np.asarray(quat, dtype=float) / np.linalg.norm(quat)
+
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+        [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+        [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)]
+    ])
+
+
+class MazeModel:
+    """
+    The parts of a MuJoCo model needed to simulate the maze without MuJoCo: the slide joints and their velocity
+    actuators, the body masses and the axis-aligned boxes of the box and mesh geoms and of the box sites. The bodies
+    and the joints are indexed in the same order as MuJoCo, with the world body at index 0.
+    """
+
+    def __init__(self, xml_name):
+        """
+        The initialization of the class.
+
+        :param xml_name: the name of the xml file in mujoco_model
+        """
+        model_path = os.path.join(pathlib.Path(__file__).parent, "mujoco_model/", xml_name)
+        root = ElementTree.parse(model_path).getroot()
+
+        compiler = root.find('compiler')
+        mesh_dir = os.path.join(os.path.dirname(model_path),
+                                compiler.get('meshdir', '') if compiler is not None else '')
+        self.mesh_files = {}
+
+        for asset in root.findall('asset'):
+            for mesh in asset.findall('mesh'):
+                self.mesh_files[mesh.get('name')] = (os.path.join(mesh_dir, mesh.get('file')),
+                                                     _floats(mesh.get('scale', '1 1 1')))
+
+        option = root.find('option')
+        self.timestep = float(option.get('timestep', 0.002)) if option is not None else 0.002
+
+        self.defaults = {}
+        default = root.find('default')
+
+        if default is not None:
+            self._parse_default(default, {})
+
+        self.body_names = ['world']
+        self.body_pos = [np.zeros(3)]
+        self.body_mass = [0.0]
+        self.body_parents = [0]
+        self.jnt_names = []
+        self.jnt_body = []
+        self.jnt_axis = []
+        self.jnt_damping = []
+        self.jnt_armature = []
+        self.geom_names = []
+        self.geom_body = []
+        self.geom_center = []
+        self.geom_half_size = []
+        self.site_names = []
+        self.site_body = []
+        self.site_center = []
+        self.site_half_size = []
+
+        for body in root.find('worldbody').findall('body'):
+            self._parse_body(body, 0, np.zeros(3), np.eye(3))
+
+        self.actuator_jnt = []
+        self.actuator_kv = []
+
+        for actuator in root.find('actuator'):
+            if actuator.tag != 'velocity':
+                raise ValueError("Only velocity actuators are supported, found %s." % actuator.tag)
+
+            self.actuator_jnt.append(self.jnt_names.index(actuator.get('joint')))
+            self.actuator_kv.append(float(actuator.get('kv', 1)))
+
+    def _parse_default(self, element, inherited):
+        attributes = {tag: dict(values) for tag, values in inherited.items()}
+
+        for child in element:
+            if child.tag != 'default':
+                attributes.setdefault(child.tag, {}).update(child.attrib)
+
+        self.defaults[element.get('class', 'main')] = attributes
+
+        for child in element.findall('default'):
+            self._parse_default(child, attributes)
+
+    def _attributes(self, element):
+        attributes = dict(self.defaults.get('main', {}).get(element.tag, {}))
+        attributes.update(self.defaults.get(element.get('class', 'main'), {}).get(element.tag, {}))
+        attributes.update(element.attrib)
+
+        return attributes
+
+    def _parse_body(self, body, parent_index, parent_pos, parent_rot):
+        body_index = len(self.body_names)
+        pos = parent_pos + parent_rot @ np.array(_floats(body.get('pos', '0 0 0')))
+        rot = parent_rot @ _quat_to_mat(_floats(body.get('quat', '1 0 0 0')))
+        self.body_names.append(body.get('name'))
+        self.body_pos.append(pos)
+        self.body_mass.append(0.0)
+        self.body_parents.append(parent_index)
+
+        for joint in body.findall('joint'):
+            attributes = self._attributes(joint)
+
+            if attributes.get('type', 'hinge') != 'slide':
+                raise ValueError("Only slide joints are supported, found %s." % attributes.get('type', 'hinge'))
+
+            self.jnt_names.append(attributes.get('name'))
+            self.jnt_body.append(body_index)
+            self.jnt_axis.append(rot @ np.array(_floats(attributes.get('axis', '0 0 1'))))
+            self.jnt_damping.append(float(attributes.get('damping', 0)))
+            self.jnt_armature.append(float(attributes.get('armature', 0)))
+
+        for geom in body.findall('geom'):
+            attributes = self._attributes(geom)
+            self.body_mass[body_index] += float(attributes.get('mass', 0))
+
+            geom_type = attributes.get('type', 'sphere')
+            geom_pos = np.array(_floats(attributes.get('pos', '0 0 0')))
+            geom_rot = rot @ _quat_to_mat(_floats(attributes.get('quat', '1 0 0 0')))
+
+            if geom_type == 'box':
+                center = pos + rot @ geom_pos
+                half_size = np.abs(geom_rot) @ np.array(_floats(attributes['size']))
+            elif geom_type == 'mesh':
+                # MuJoCo recenters the mesh but moves the geom frame to compensate, so the vertices of the file are
+                # where they appear in the geom frame.
+                mesh_path, scale = self.mesh_files[attributes['mesh']]
+                vertices = _read_stl_vertices(mesh_path) * np.array(scale)
+                lower = vertices.min(axis=0)
+                upper = vertices.max(axis=0)
+                center = pos + rot @ geom_pos + geom_rot @ ((lower + upper) / 2)
+                half_size = np.abs(geom_rot) @ ((upper - lower) / 2)
+            else:
+                continue
+
+            self.geom_names.append(attributes.get('name'))
+            self.geom_body.append(body_index)
+            self.geom_center.append(center)
+            self.geom_half_size.append(half_size)
+
+        for site in body.findall('site'):
+            attributes = self._attributes(site)
+
+            if attributes.get('type', 'sphere') != 'box':
+                continue
+
+            site_rot = rot @ _quat_to_mat(_floats(attributes.get('quat', '1 0 0 0')))
+            self.site_names.append(attributes.get('name'))
+            self.site_body.append(body_index)
+            self.site_center.append(pos + rot @ np.array(_floats(attributes.get('pos', '0 0 0'))))
+            self.site_half_size.append(np.abs(site_rot) @ np.array(_floats(attributes['size'])))
+
+        for child in body.findall('body'):
+            self._parse_body(child, body_index, pos, rot)
+
+    def get_body_index(self, body_name):
+        """
+        Gets the index of a body using its name.
+
+        :param body_name: the name of the body
+        :return: the index of the body, or -1 if it does not exist
+        """
+        return self.body_names.index(body_name) if body_name in self.body_names else -1
+
+    def get_jnt_index(self, jnt_name):
+        """
+        Gets the index of a joint using its name.
+
+        :param jnt_name: the name of the joint
+        :return: the index of the joint, or -1 if it does not exist
+        """
+        return self.jnt_names.index(jnt_name) if jnt_name in self.jnt_names else -1
+
+    def get_jnt_mass(self):
+        """
+        Gets the mass moved by each slide joint, which is the mass of the subtree of its body plus its armature.
+
+        :return: an array of the masses
+        """
+        subtree_mass = list(self.body_mass)
+
+        # The bodies are stored depth first, so the children come after their parents.
+        for body_index in range(len(self.body_names) - 1, 0, -1):
+            subtree_mass[self.body_parents[body_index]] += subtree_mass[body_index]
+
+        return np.array([subtree_mass[body_index] + armature
+                         for body_index, armature in zip(self.jnt_body, self.jnt_armature)])
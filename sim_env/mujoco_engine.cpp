@@ -283,6 +283,54 @@ void Sim::step(double obstacle_speed, double agent_x_speed, double agent_y_speed
     }
 }
 
+/**
+ * Gets the number of the bodies, including the world body.
+ *
+ * @return the number of the bodies
+ */
+int Sim::get_num_bodies() {
+    return m->nbody;
+}
+
+/**
+ * Gets the number of the joint positions.
+ *
+ * @return the number of the joint positions
+ */
+int Sim::get_num_qpos() {
+    return m->nq;
+}
+
+/**
+ * Copies the state into the given buffer: the absolute positions x and y of all bodies in the order of their indices,
+ * followed by the reference positions of all joints.
+ *
+ * @param buffer the buffer of at least 2 * get_num_bodies() + get_num_qpos() doubles
+ */
+void Sim::get_state(double *buffer) {
+    for (int i = 0; i < m->nbody; i++) {
+        buffer[2 * i] = d->xpos[3 * i];
+        buffer[2 * i + 1] = d->xpos[3 * i + 1];
+    }
+
+    for (int i = 0; i < m->nq; i++) {
+        buffer[2 * m->nbody + i] = d->qpos[i];
+    }
+}
+
+/**
+  * Steps the simulation and copies the state into the given buffer.
+  *
+  * @param obstacle_speed the speed of the obstacle to be set
+  * @param agent_x_speed  the x speed of the agent to be set
+  * @param agent_y_speed  the x speed of the agent to be set
+  * @param buffer         the buffer of at least 2 * get_num_bodies() + get_num_qpos() doubles
+  */
+void Sim::step_and_observe(double obstacle_speed, double agent_x_speed, double agent_y_speed, double *buffer) {
+    this->step(obstacle_speed, agent_x_speed, agent_y_speed);
+    this->get_state(buffer);
+}
+
 /**
  * Initializes the MuJoCo environment.
  *
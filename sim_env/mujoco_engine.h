@@ -107,6 +107,38 @@ public:
      */
     void step(double obstacle_speed, double agent_x_speed, double agent_y_speed);
 
+    /**
+     * Gets the number of the bodies, including the world body.
+     *
+     * @return the number of the bodies
+     */
+    int get_num_bodies();
+
+    /**
+     * Gets the number of the joint positions.
+     *
+     * @return the number of the joint positions
+     */
+    int get_num_qpos();
+
+    /**
+     * Copies the state into the given buffer: the absolute positions x and y of all bodies in the order of their
+     * indices, followed by the reference positions of all joints.
+     *
+     * @param buffer the buffer of at least 2 * get_num_bodies() + get_num_qpos() doubles
+     */
+    void get_state(double *buffer);
+
+    /**
+     * Steps the simulation and copies the state into the given buffer.
+     *
+     * @param obstacle_speed the speed of the obstacle to be set
+     * @param agent_x_speed  the x speed of the agent to be set
+     * @param agent_y_speed  the x speed of the agent to be set
+     * @param buffer         the buffer of at least 2 * get_num_bodies() + get_num_qpos() doubles
+     */
+    void step_and_observe(double obstacle_speed, double agent_x_speed, double agent_y_speed, double *buffer);
+
 private:
     /**
      * Initializes the MuJoCo environment.
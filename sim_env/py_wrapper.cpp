@@ -152,4 +152,54 @@ void step(void *ptr, double obstacle_speed, double agent_x_speed, double agent_y
     Sim *ref = reinterpret_cast<Sim *>(ptr);
     ref->step(obstacle_speed, agent_x_speed, agent_y_speed);
 }
+
+/**
+ * Gets the number of the bodies, including the world body.
+ *
+ * @param ptr the pointer to the current instance
+ *
+ * @return the number of the bodies
+ */
+int get_num_bodies(void *ptr) {
+    Sim *ref = reinterpret_cast<Sim *>(ptr);
+    return ref->get_num_bodies();
+}
+
+/**
+ * Gets the number of the joint positions.
+ *
+ * @param ptr the pointer to the current instance
+ *
+ * @return the number of the joint positions
+ */
+int get_num_qpos(void *ptr) {
+    Sim *ref = reinterpret_cast<Sim *>(ptr);
+    return ref->get_num_qpos();
+}
+
+/**
+ * Copies the state into the given buffer: the absolute positions x and y of all bodies in the order of their indices,
+ * followed by the reference positions of all joints.
+ *
+ * @param ptr    the pointer to the current instance
+ * @param buffer the buffer of at least 2 * get_num_bodies() + get_num_qpos() doubles
+ */
+void get_state(void *ptr, double *buffer) {
+    Sim *ref = reinterpret_cast<Sim *>(ptr);
+    ref->get_state(buffer);
+}
+
+/**
+ * Steps the simulation and copies the state into the given buffer.
+ *
+ * @param ptr            the pointer to the current instance
+ * @param obstacle_speed the speed of the obstacle to be set
+ * @param agent_x_speed  the x speed of the agent to be set
+ * @param agent_y_speed  the x speed of the agent to be set
+ * @param buffer         the buffer of at least 2 * get_num_bodies() + get_num_qpos() doubles
+ */
+void step_and_observe(void *ptr, double obstacle_speed, double agent_x_speed, double agent_y_speed, double *buffer) {
+    Sim *ref = reinterpret_cast<Sim *>(ptr);
+    ref->step_and_observe(obstacle_speed, agent_x_speed, agent_y_speed, buffer);
+}
 }
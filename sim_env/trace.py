@@ -0,0 +1,107 @@
+import os
+import pathlib
+import random
+
+import numpy as np
+
+TRACE_COLUMNS = ['obstacle_speed', 'agent_x_speed', 'agent_y_speed', 'obstacle_x', 'obstacle_y', 'agent_x', 'agent_y']
+
+
+def generate_speeds(num_steps, agent_pos, agent_region, x_limit=10, seed=None):
+    """
+    Generates the speeds of an episode like the experiments, with the obstacle bouncing between the limits and the
+    agent moving in a random direction every 10 steps without leaving the given region, so that it does not touch
+    anything.
+
+    :param num_steps: the number of the steps
+    :param agent_pos: the initial position of the agent
+    :param agent_region: the region (min x, max x, min y, max y) of the agent position
+    :param x_limit: the limit of the obstacle position x
+    :param seed: the seed of the random directions
+    :return: a list of (obstacle speed, agent speed x, agent speed y), and the initial obstacle position x
+    """
+    rng = random.Random(seed)
+    x_start = rng.uniform(-x_limit, x_limit)
+    obstacle_speed = rng.choice([-1, 1])
+    obstacle_x = x_start
+    agent_x, agent_y = agent_pos
+    agent_speed = (0, 0)
+    speeds = []
+
+    for step in range(num_steps):
+        if step % 10 == 0:
+            # A unit speed moves a body by about 2.5 in 10 steps, and the margin covers the rest of the transient.
+            directions = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                          if agent_region[0] <= agent_x + 3 * dx <= agent_region[1]
+                          and agent_region[2] <= agent_y + 3 * dy <= agent_region[3]]
+            agent_speed = rng.choice(directions)
+
+        if obstacle_x < -x_limit:
+            obstacle_speed = 1
+
+        if obstacle_x > x_limit:
+            obstacle_speed = -1
+
+        speeds.append((obstacle_speed, agent_speed[0], agent_speed[1]))
+        obstacle_x += obstacle_speed * 0.25
+        agent_x += agent_speed[0] * 0.25
+        agent_y += agent_speed[1] * 0.25
+
+    return speeds, x_start
+
+
+def record_trace(env, obstacle_pos, agent_pos, speeds):
+    """
+    Records the positions of the obstacle and the agent of an environment, either SimEnv or KinematicSimEnv, stepping
+    with the given speeds.
+
+    :param env: the environment
+    :param obstacle_pos: the initial position of the obstacle
+    :param agent_pos: the initial position of the agent
+    :param speeds: a list of (obstacle speed, agent speed x, agent speed y)
+    :return: an array with the columns of TRACE_COLUMNS, whose first row is the state after the reset
+    """
+    env.reset(obstacle_pos=obstacle_pos, agent_pos=agent_pos)
+    trace = [(0, 0, 0) + env.get_xpos(env.obstacle_body_index) + env.get_xpos(env.agent_body_index)]
+
+    for speed in speeds:
+        env.step(speed)
+        trace.append(tuple(speed) + env.get_xpos(env.obstacle_body_index) + env.get_xpos(env.agent_body_index))
+
+    return np.array(trace, dtype=np.float64)
+
+
+def save_trace(trace, trace_path):
+    np.savetxt(trace_path, trace, delimiter=',', header=','.join(TRACE_COLUMNS), comments='', fmt='%.17g')
+
+
+def load_trace(trace_path):
+    return np.loadtxt(trace_path, delimiter=',', skiprows=1)
+
+
+def compare_trace(env, trace):
+    """
+    Replays a recorded trace in an environment.
+
+    :param env: the environment
+    :param trace: the recorded trace
+    :return: the largest position difference between the replay and the trace
+    """
+    obstacle_pos = (trace[0, 3], trace[0, 4])
+    agent_pos = (trace[0, 5], trace[0, 6])
+    replay = record_trace(env, obstacle_pos, agent_pos, [tuple(speed) for speed in trace[1:, :3]])
+
+    return np.abs(replay[:, 3:] - trace[:, 3:]).max().item()
+
+
+if __name__ == '__main__':
+    from sim_env.kinematic_env import KinematicSimEnv
+
+    # The traces are recorded from MuJoCo with record_trace and save_trace, using generate_speeds(400, (4, 6),
+    # (-1, 10, 3, 10), seed=i) and the agent starting at (4, 6) so that nothing but the floor is touched.
+    trace_dir = os.path.join(pathlib.Path(__file__).parent, "traces")
+    env = KinematicSimEnv(xml_name="maze.xml")
+
+    for trace_name in sorted(os.listdir(trace_dir)):
+        error = compare_trace(env, load_trace(os.path.join(trace_dir, trace_name)))
+        print("%s: max position error %.3e, %s" % (trace_name, error, "passed" if error < 1e-6 else "FAILED"))
@@ -0,0 +1,268 @@
+import numpy as np
+
+from sim_env.kinematic_env import get_substep_params, get_substep_coefficients
+from sim_env.maze_model import MazeModel
+
+
+class VecSimEnv:
+    """
+    A batch of independent maze episodes, simulated like KinematicSimEnv and stepped together. The state of all the
+    episodes is held in arrays whose first dimension is the episode.
+
+    An episode is done once the agent reaches the goal region, which is the box site of the goal body, or once the box
+    of the agent overlaps the box of any other body. The done masks stay set until the episode is reset, and the done
+    episodes keep being simulated.
+    """
+
+    def __init__(self, xml_name, num_envs, step_duration=0.5):
+        """
+        The initialization of the class.
+
+        :param xml_name: the name of the xml file in mujoco_model
+        :param num_envs: the number of the episodes
+        :param step_duration: the simulated time of each step
+        """
+        self.model = MazeModel(xml_name)
+        self.num_envs = num_envs
+        self.step_duration = step_duration
+        self.timestep = self.model.timestep
+
+        num_jnts = len(self.model.jnt_names)
+        num_bodies = len(self.model.body_names)
+        self.alpha, self.beta = get_substep_params(self.model)
+        self.substep_coefficients = {}
+
+        # Maps the speeds in the order of the actuators to the forces of the joints.
+        self.actuator_force = np.zeros((len(self.model.actuator_jnt), num_jnts))
+
+        for actuator_index, (jnt_index, kv) in enumerate(zip(self.model.actuator_jnt, self.model.actuator_kv)):
+            self.actuator_force[actuator_index, jnt_index] += kv
+
+        # Maps the joint positions to the displacements of the bodies.
+        self.body_jnt_axis = np.zeros((num_jnts, num_bodies, 2))
+
+        for jnt_index, (body_index, axis) in enumerate(zip(self.model.jnt_body, self.model.jnt_axis)):
+            self.body_jnt_axis[jnt_index, body_index] = axis[:2]
+
+        # Indices of the object bodies.
+        self.obstacle_body_index = self.get_body_index("obstacle")
+        self.agent_body_index = self.get_body_index("agent")
+        goal_body_index = self.get_body_index("goal")
+
+        # Indices of the joints.
+        self.obstacle_jnt_index = self.get_jnt_index("slider:obstacle")
+        self.agent_jnt_x_index = self.get_jnt_index("slider:agent-x")
+        self.agent_jnt_y_index = self.get_jnt_index("slider:agent-y")
+
+        # The boxes of the geoms relative to their bodies, split into the agent and the rest.
+        geom_body = np.array(self.model.geom_body)
+        geom_offset = np.array([center[:2] - self.model.body_pos[body_index][:2]
+                                for body_index, center in zip(self.model.geom_body, self.model.geom_center)])
+        geom_half_size = np.array([half_size[:2] for half_size in self.model.geom_half_size])
+        is_agent = geom_body == self.agent_body_index
+        self.agent_geom_body = geom_body[is_agent]
+        self.agent_geom_offset = geom_offset[is_agent]
+        self.agent_geom_half_size = geom_half_size[is_agent]
+        self.other_geom_body = geom_body[~is_agent]
+        self.other_geom_offset = geom_offset[~is_agent]
+        self.other_geom_half_size = geom_half_size[~is_agent]
+
+        goal_site_index = self.model.site_body.index(goal_body_index)
+        goal_center = self.model.site_center[goal_site_index][:2]
+        goal_half_size = self.model.site_half_size[goal_site_index][:2]
+        self.goal_lower = goal_center - goal_half_size
+        self.goal_upper = goal_center + goal_half_size
+
+        self.body_pos = np.tile(np.array([pos[:2] for pos in self.model.body_pos]), (num_envs, 1, 1))
+        self.time = np.zeros(num_envs)
+        self.qpos = np.zeros((num_envs, num_jnts))
+        self.qvel = np.zeros((num_envs, num_jnts))
+
+        # MuJoCo computes the body positions before integrating, so they lag one substep behind qpos.
+        self.xpos_qpos = np.zeros((num_envs, num_jnts))
+
+        self.reached_goal = np.zeros(num_envs, dtype=bool)
+        self.collided = np.zeros(num_envs, dtype=bool)
+        self.done = np.zeros(num_envs, dtype=bool)
+        self.reset()
+
+    def close(self):
+        """
+        Closes the instance.
+
+        :return: None
+        """
+        pass
+
+    def render(self):
+        """
+        Does nothing, since the environment has no window.
+
+        :return: None
+        """
+        pass
+
+    def reset(self, env_indices=None, obstacle_pos=(0.0, 0.0), agent_pos=(2.0, -11.0)):
+        """
+        Resets the given episodes to the initial state.
+
+        :param env_indices: the indices or the boolean mask of the episodes to reset, or None for all the episodes
+        :param obstacle_pos: the initial positions of the obstacle, of shape (2,) or (number of episodes, 2)
+        :param agent_pos: the initial positions of the agent, of shape (2,) or (number of episodes, 2)
+        :return: the done mask of all the episodes
+        """
+        if env_indices is None:
+            env_indices = slice(None)
+
+        self.body_pos[env_indices, self.obstacle_body_index] = obstacle_pos
+        self.body_pos[env_indices, self.agent_body_index] = agent_pos
+        self.time[env_indices] = 0.0
+        self.qpos[env_indices] = 0.0
+        self.qvel[env_indices] = 0.0
+        self.xpos_qpos[env_indices] = 0.0
+        self.reached_goal[env_indices] = False
+        self.collided[env_indices] = False
+        self._update_done()
+
+        return self.done
+
+    def step(self, speeds):
+        """
+        Makes the actuators of all the episodes do the given actions.
+
+        :param speeds: an array of shape (number of episodes, number of actuators), or (number of actuators,) for the
+            same speeds in all the episodes, where the actuators are ordered like the speed of SimEnv.step
+        :return: the done mask of all the episodes
+        """
+        num_substeps = self._count_substeps()
+
+        # The episodes usually share one or two numbers of the substeps.
+        unique_substeps, substep_indices = np.unique(num_substeps, return_inverse=True)
+        coefficients = np.stack([self._get_substep_coefficients(n) for n in unique_substeps])[substep_indices]
+        v_v, v_f, q_v, q_f, lag_q_v, lag_q_f = np.moveaxis(coefficients, 2, 0)
+
+        force = np.asarray(speeds, dtype=np.float64) @ self.actuator_force
+        v = self.qvel
+        q = self.qpos
+        self.qvel = v_v * v + v_f * force
+        self.qpos = q + q_v * v + q_f * force
+        self.xpos_qpos = q + lag_q_v * v + lag_q_f * force
+        self._update_done()
+
+        return self.done
+
+    def _count_substeps(self):
+        """
+        Counts the substeps of each episode the same way as the MuJoCo loop, which accumulates the time in floating
+        point, and advances the time.
+
+        :return: an array of the numbers of the substeps
+        """
+        unique_times, time_indices = np.unique(self.time, return_inverse=True)
+
+        # The episodes reset together share their time, so there are usually few distinct times to count in Python.
+        if len(unique_times) <= 64:
+            end_times = []
+            unique_substeps = []
+
+            for start_time in unique_times.tolist():
+                end_time = start_time
+                n = 0
+
+                while end_time - start_time < self.step_duration:
+                    end_time += self.timestep
+                    n += 1
+
+                end_times.append(end_time)
+                unique_substeps.append(n)
+
+            self.time = np.array(end_times)[time_indices]
+
+            return np.array(unique_substeps)[time_indices]
+
+        start_time = self.time.copy()
+        num_substeps = np.zeros(self.num_envs, dtype=np.int64)
+        running = self.time - start_time < self.step_duration
+
+        while running.any():
+            self.time[running] += self.timestep
+            num_substeps[running] += 1
+            running = self.time - start_time < self.step_duration
+
+        return num_substeps
+
+    def _get_substep_coefficients(self, num_substeps):
+        coefficients = self.substep_coefficients.get(num_substeps)
+
+        if coefficients is None:
+            coefficients = np.array(get_substep_coefficients(self.alpha, self.beta, self.timestep, int(num_substeps)))
+            self.substep_coefficients[num_substeps] = coefficients
+
+        return coefficients
+
+    def _update_done(self):
+        xpos = self.get_all_xpos()
+        agent_xpos = xpos[:, self.agent_body_index]
+        self.reached_goal |= np.all((agent_xpos > self.goal_lower) & (agent_xpos < self.goal_upper), axis=1)
+
+        # Overlaps of the boxes of the agent, of shape (episodes, agent geoms, other geoms, 2).
+        agent_center = xpos[:, self.agent_geom_body] + self.agent_geom_offset
+        other_center = xpos[:, self.other_geom_body] + self.other_geom_offset
+        distance = np.abs(agent_center[:, :, None] - other_center[:, None])
+        overlap = distance < self.agent_geom_half_size[:, None] + self.other_geom_half_size[None]
+        self.collided |= np.all(overlap, axis=3).any(axis=(1, 2))
+
+        self.done = self.reached_goal | self.collided
+
+    def get_body_index(self, body_name):
+        """
+        Gets the index of a body using its name.
+
+        :param body_name: the name of the body
+        :return: the index of the body
+        """
+        return self.model.get_body_index(body_name)
+
+    def get_jnt_index(self, jnt_name):
+        """
+        Gets the index of a joint using its name.
+
+        :param jnt_name: the name of the joint
+        :return: the index of the joint
+        """
+        return self.model.get_jnt_index(jnt_name)
+
+    def get_body_ini_pos(self, body_index):
+        """
+        Gets the initial positions of the simulation object represented by the given index.
+
+        :param body_index: the index representing a simulation object
+        :return: an array of shape (number of episodes, 2)
+        """
+        return self.body_pos[:, body_index].copy()
+
+    def get_qpos(self, jnt_index):
+        """
+        Gets the reference positions of the joint represented by the given index.
+
+        :param jnt_index: the index representing a joint
+        :return: an array of shape (number of episodes,)
+        """
+        return self.qpos[:, jnt_index].copy()
+
+    def get_xpos(self, body_index):
+        """
+        Gets the absolute positions of the simulation object represented by the given index.
+
+        :param body_index: the index representing a simulation object
+        :return: an array of shape (number of episodes, 2)
+        """
+        return self.body_pos[:, body_index] + self.xpos_qpos @ self.body_jnt_axis[:, body_index]
+
+    def get_all_xpos(self):
+        """
+        Gets the absolute positions of all the simulation objects.
+
+        :return: an array of shape (number of episodes, number of bodies, 2)
+        """
+        return self.body_pos + np.einsum('nj,jbk->nbk', self.xpos_qpos, self.body_jnt_axis)